@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+"""
+Vectorized opportunity analytics
+Counts, cross-tabs and weekly volumes by document type, agency, NAICS and set-aside
+
+Every column is factorized once into integer codes (-1 = missing), so a
+group-by is a bincount over the codes and a cross-tab a bincount over
+row_code * n_columns + column_code. With numpy installed these run as
+array operations; without it the same algorithms run in pure Python and
+return identical results.
+"""
+
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Frame column -> facet_index.FACETS name it can be built from
+FACET_COLUMNS = {
+    "document_type": "document_class",
+    "agency": "agency",
+    "naics": "naics",
+    "set_aside": "set_aside",
+    "notice_type": "notice_type",
+    "posted_week": "posted_week",
+}
+
+
+def _codes(values) -> Sequence[int]:
+    """array('i') -> ndarray when numpy is available"""
+    if NUMPY_AVAILABLE:
+        return np.frombuffer(values, dtype=np.int32) if len(values) else np.zeros(0, dtype=np.int32)
+    return values
+
+
+def _bincount(codes, size: int) -> List[int]:
+    """Occurrences of each code 0..size-1 (missing values, -1, are skipped)"""
+    if NUMPY_AVAILABLE:
+        return np.bincount(codes[codes >= 0], minlength=size).tolist()
+    counts = [0] * size
+    for code in codes:
+        if code >= 0:
+            counts[code] += 1
+    return counts
+
+
+def _bincount2(row_codes, col_codes, rows: int, cols: int) -> List[List[int]]:
+    """rows x cols table of code pair occurrences"""
+    if NUMPY_AVAILABLE:
+        valid = (row_codes >= 0) & (col_codes >= 0)
+        flat = row_codes[valid].astype(np.int64) * cols + col_codes[valid]
+        return np.bincount(flat, minlength=rows * cols).reshape(rows, cols).tolist()
+    table = [[0] * cols for _ in range(rows)]
+    for row, col in zip(row_codes, col_codes):
+        if row >= 0 and col >= 0:
+            table[row][col] += 1
+    return table
+
+
+def _rolling_sum(values: List[int], window: int) -> List[int]:
+    """Sum of each value and the window - 1 before it"""
+    if NUMPY_AVAILABLE and values:
+        return np.convolve(np.array(values, dtype=np.int64), np.ones(window, dtype=np.int64))[:len(values)].tolist()
+    sums, running = [], 0
+    for i, value in enumerate(values):
+        running += value - (values[i - window] if i >= window else 0)
+        sums.append(running)
+    return sums
+
+
+def _ids_from_bitmap(bitmap: int):
+    """Set bit positions of a facet bitmap, ascending"""
+    if not isinstance(bitmap, int):
+        # FacetIndex posting already stored as a sorted id array
+        return np.frombuffer(bitmap, dtype=np.uint32) if NUMPY_AVAILABLE and len(bitmap) else bitmap
+    if not NUMPY_AVAILABLE:
+        from facet_index import ids_from_bitmap
+        return ids_from_bitmap(bitmap)
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    return np.flatnonzero(np.unpackbits(np.frombuffer(data, dtype=np.uint8), bitorder="little"))
+
+
+def _percent(count: int, total: int) -> float:
+    return count / total * 100 if total > 0 else 0
+
+
+class OpportunityFrame:
+    """
+    Factorized columns of a set of opportunities.
+
+    Build it from rows (from_rows, e.g. streamed from the database) or
+    from a FacetIndex (from_facets, the API dataset); both keep only the
+    int codes and the distinct labels, not the rows. Results are plain
+    dicts/lists, ready for JSON.
+    """
+
+    def __init__(self, labels: Dict[str, List[str]], codes: Dict[str, Sequence[int]], size: int):
+        self.labels = labels
+        self.codes = codes
+        self.size = size
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence], columns: Sequence[str]) -> "OpportunityFrame":
+        """One frame column per position of each row tuple; falsy values are missing"""
+        lookups = [{} for _ in columns]
+        codes = [array("i") for _ in columns]
+        size = 0
+        for row in rows:
+            for value, lookup, column_codes in zip(row, lookups, codes):
+                if value:
+                    code = lookup.get(value)
+                    if code is None:
+                        code = lookup[value] = len(lookup)
+                    column_codes.append(code)
+                else:
+                    column_codes.append(-1)
+            size += 1
+        return cls({name: list(lookup) for name, lookup in zip(columns, lookups)},
+                   {name: _codes(column_codes) for name, column_codes in zip(columns, codes)}, size)
+
+    @classmethod
+    def from_facets(cls, facets, columns: Optional[Sequence[str]] = None) -> "OpportunityFrame":
+        """Frame over a facet_index.FacetIndex's documents, from its value postings"""
+        size = facets.doc_count
+        labels, codes = {}, {}
+        for name in columns or FACET_COLUMNS:
+            values = facets.postings.get(FACET_COLUMNS.get(name, name), {})
+            labels[name] = list(values)
+            if NUMPY_AVAILABLE:
+                column_codes = np.full(size, -1, dtype=np.int32)
+                for code, posting in enumerate(values.values()):
+                    column_codes[_ids_from_bitmap(posting)] = code
+            else:
+                column_codes = array("i", [-1]) * size
+                for code, posting in enumerate(values.values()):
+                    for doc_id in _ids_from_bitmap(posting):
+                        column_codes[doc_id] = code
+            codes[name] = column_codes
+        return cls(labels, codes, size)
+
+    def take(self, rows) -> "OpportunityFrame":
+        """Frame of the given row positions (e.g. facet_index.ids_from_bitmap of a filter)"""
+        if NUMPY_AVAILABLE:
+            rows = np.asarray(rows, dtype=np.int64)
+            codes = {name: column_codes[rows] for name, column_codes in self.codes.items()}
+        else:
+            codes = {name: array("i", (column_codes[row] for row in rows))
+                     for name, column_codes in self.codes.items()}
+        return OpportunityFrame(self.labels, codes, len(rows))
+
+    def select(self, bitmap: int) -> "OpportunityFrame":
+        """Frame of the documents in a facet bitmap (e.g. FacetIndex.match of some filters)"""
+        return self.take(_ids_from_bitmap(bitmap))
+
+    def counts(self, column: str, limit: Optional[int] = None) -> List[Dict]:
+        """[{'value', 'count', 'percentage'}] by count desc; percentages of all rows"""
+        counts = _bincount(self.codes[column], len(self.labels[column]))
+        groups = [{"value": value, "count": count, "percentage": _percent(count, self.size)}
+                  for value, count in zip(self.labels[column], counts) if count]
+        groups.sort(key=lambda g: (-g["count"], g["value"]))
+        return groups[:limit] if limit else groups
+
+    def crosstab(self, rows: str, columns: str = "document_type", limit: Optional[int] = None) -> Dict:
+        """
+        Counts for each rows value broken down by columns value, e.g.
+        document types per agency.
+
+        Returns:
+            {'columns': [column values], 'rows': [{'value', 'total', 'counts': {column value: n},
+             'percentages': {column value: % of the row}}, ...] by total desc}
+        """
+        row_labels, column_labels = self.labels[rows], self.labels[columns]
+        table = _bincount2(self.codes[rows], self.codes[columns], len(row_labels), len(column_labels))
+        column_totals = [sum(column) for column in zip(*table)] if table else []
+        used = [i for i, total in enumerate(column_totals) if total]
+
+        result = []
+        for value, counts in zip(row_labels, table):
+            total = sum(counts)
+            if not total:
+                continue
+            result.append({
+                "value": value,
+                "total": total,
+                "counts": {column_labels[i]: counts[i] for i in used},
+                "percentages": {column_labels[i]: _percent(counts[i], total) for i in used},
+            })
+        result.sort(key=lambda r: (-r["total"], r["value"]))
+        return {
+            "columns": sorted(column_labels[i] for i in used),
+            "rows": result[:limit] if limit else result,
+        }
+
+    def weekly(self, by: str = "document_type", window: int = 4, week_column: str = "posted_week") -> List[Dict]:
+        """
+        Postings per week (weeks start on Monday; weeks without postings
+        are included with zero counts), broken down by the by column, with
+        the rolling volume of the last window weeks.
+
+        Returns:
+            [{'week': 'YYYY-MM-DD', 'total', 'rolling_total', 'counts': {by value: n}}, ...] oldest first
+        """
+        if window < 1:
+            raise ValueError(f"window must be at least 1 week, got {window}")
+        week_labels = self.labels[week_column]
+        if not week_labels:
+            return []
+
+        # Position of each week label on a contiguous Monday-to-Monday axis
+        weeks = [datetime.strptime(week, "%Y-%m-%d") for week in week_labels]
+        first = min(weeks)
+        positions = [(week - first).days // 7 for week in weeks]
+        span = max(positions) + 1
+
+        week_codes = self.codes[week_column]
+        if NUMPY_AVAILABLE:
+            lookup = np.array(positions + [-1], dtype=np.int32)
+            axis = lookup[week_codes]  # -1 indexes the trailing -1
+        else:
+            axis = array("i", (positions[code] if code >= 0 else -1 for code in week_codes))
+
+        by_labels = self.labels[by]
+        table = _bincount2(axis, self.codes[by], span, len(by_labels))
+        totals = _bincount(axis, span)
+        rolling = _rolling_sum(totals, window)
+
+        return [{
+            "week": (first + timedelta(weeks=i)).strftime("%Y-%m-%d"),
+            "total": totals[i],
+            "rolling_total": rolling[i],
+            "counts": {value: count for value, count in zip(by_labels, table[i]) if count},
+        } for i in range(span)]
+
+    def summary(self, by: Sequence[str] = ("agency", "naics", "set_aside"), limit: Optional[int] = 10,
+                window: int = 4) -> Dict:
+        """Document type counts, a document type cross-tab for each by column and weekly volumes"""
+        return {
+            "total": self.size,
+            "document_types": self.counts("document_type"),
+            "breakdowns": {column: self.crosstab(column, "document_type", limit=limit)
+                           for column in by if column in self.codes},
+            "weekly": self.weekly("document_type", window=window) if "posted_week" in self.codes else [],
+            "engine": "numpy" if NUMPY_AVAILABLE else "python",
+        }
@@ -1,107 +1,251 @@
 from flask import Flask, render_template, request, jsonify, send_from_directory
 from pathlib import Path
-import csv
+import base64
 import json
+import os
 import re
+import signal
 from datetime import datetime
 
+from classifier import classify_document
+from data_loader import DataLoader
+from jobs import JobQueue
+from response_cache import ResponseCache
+
 app = Flask(__name__, template_folder='.', static_folder='.')
 
-# Global data cache
-OPPORTUNITIES = []
-ALL_COLUMNS = []
+# Global data cache. Handlers read LOADER.dataset once and use that
+# snapshot throughout, so a reload mid-request can't mix two versions.
+LOADER = DataLoader(Path("data"))
+
+# Cached JSON bodies of the read-only endpoints, dropped whenever the
+# dataset version changes
+RESPONSE_CACHE = ResponseCache(lambda: LOADER.dataset.version)
+
+# Background work for /api/download-docs and /api/analyze
+JOBS = JobQueue()
+
+# Set in gunicorn workers (see gunicorn.conf.py). Data is loaded once in the
+# master and shared with forked workers, so reloads are done by the master.
+MASTER_PID = None
+
+# Default projection for list/search rows: what the dashboard cards show.
+# Pass fields=... for other columns, fields=* for whole records, or fetch
+# one record from /api/opportunities/<noticeId>.
+LIST_FIELDS = [
+    'noticeId', 'title', 'solicitationNumber', 'postedDate', 'responseDeadLine',
+    'naicsCode', 'type', 'organizationType', 'uiLink', 'additionalInfoLink'
+]
+
+# /api/search type -> inverted index fields
+SEARCH_FIELDS = {
+    'keyword': ['title', 'description'],
+    'naics': ['naics'],
+    'organization': ['organization'],
+}
+
+# /api/search type -> FTS5 column filter (engine=fts)
+FTS_SEARCH_COLUMNS = {
+    'keyword': ['title', 'description'],
+    'naics': ['naics'],
+    'organization': ['agency'],
+}
 
 def load_csv_data():
-    """Load all CSV files from data folder"""
-    global OPPORTUNITIES, ALL_COLUMNS
-    
-    data_dir = Path("data")
-    if not data_dir.exists():
-        return False
-    
-    OPPORTUNITIES = []
-    ALL_COLUMNS = []
-    
-    csv_files = sorted(data_dir.glob("*.csv"))
-    
-    for csv_file in csv_files:
-        with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            records = list(reader)
-            if records:
-                ALL_COLUMNS = list(set(ALL_COLUMNS) | set(records[0].keys()))
-                OPPORTUNITIES.extend(records)
-    
-    ALL_COLUMNS.sort()
-    return len(OPPORTUNITIES) > 0
+    """
+    Load all CSV files from data folder (or its Arrow/Parquet snapshots if
+    present). Later calls only ingest files that are new or have changed.
+    """
+    LOADER.refresh()
+    return len(LOADER.dataset.records) > 0
 
 # Load data on startup
 load_csv_data()
 
+class StaleCursorError(ValueError):
+    """The cursor was issued for a data version that has since been reloaded"""
+
+def encode_cursor(sort_key, last_id, version=None):
+    """
+    Opaque keyset cursor: the sort key and id of the last row on a page.
+    Ids of the in-memory dataset are only valid within one data version,
+    so those cursors carry it too.
+    """
+    key = [sort_key, last_id] if version is None else [sort_key, last_id, version]
+    raw = json.dumps(key, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def requested_fields():
+    """Columns named by fields= (comma-separated); None means every column"""
+    fields = request.args.get('fields')
+    if fields is None:
+        return LIST_FIELDS
+    if fields.strip() in ('*', 'all'):
+        return None
+    return [f.strip() for f in fields.split(',') if f.strip()]
+
+def project(record, fields):
+    """
+    JSON-ready dict of just the requested columns. Reading only these from
+    the row view also skips decompressing the large text columns.
+    """
+    if fields is None:
+        return record.to_dict()
+    row = {}
+    for field in fields:
+        value = record.get(field)
+        if value is not None:
+            row[field] = value
+    return row
+
+def decode_cursor(cursor, version=None):
+    """
+    Inverse of encode_cursor; None for an empty cursor (first page).
+    Raises StaleCursorError if the cursor wasn't issued for version.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_key, last_id, *issued = json.loads(base64.urlsafe_b64decode(padded))
+        last_id = int(last_id)
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+    if issued[:1] != ([] if version is None else [version]):
+        raise StaleCursorError('The data has been reloaded since this cursor was issued; start again from the first page')
+    return sort_key, last_id
+
+def cursor_error(error):
+    """400 response for a cursor decode_cursor rejected"""
+    return jsonify({'error': str(error), 'stale_cursor': isinstance(error, StaleCursorError)}), 400
+
 @app.route('/')
 def index():
     """Serve the web dashboard"""
+    dataset = LOADER.dataset
     return render_template('dashboard.html', 
-                         total_records=len(OPPORTUNITIES),
-                         total_columns=len(ALL_COLUMNS))
+                         total_records=len(dataset.records),
+                         total_columns=len(dataset.columns))
 
 @app.route('/api/opportunities', methods=['GET'])
+@RESPONSE_CACHE.cached()
 def get_opportunities():
-    """Get opportunities with pagination"""
+    """
+    Get opportunities with pagination.
+    Pass cursor= (empty for the first page, then next_cursor) for keyset
+    paging; page= offset paging is still accepted. Rows are projected to
+    LIST_FIELDS unless fields= says otherwise.
+    """
     page = int(request.args.get('page', 1))
     per_page = int(request.args.get('per_page', 10))
+    fields = requested_fields()
+    dataset = LOADER.dataset
+    opportunities = dataset.records
+    
+    if 'cursor' in request.args:
+        try:
+            after = decode_cursor(request.args['cursor'], dataset.version)
+        except ValueError as e:
+            return cursor_error(e)
+        start = after[1] + 1 if after else 0
+        rows = [project(r, fields) for r in opportunities[start:start + per_page]]
+        end = start + len(rows)
+        total = len(opportunities)
+        return jsonify({
+            'data': rows,
+            'page': page,
+            'per_page': per_page,
+            'total': total,
+            'total_pages': (total + per_page - 1) // per_page,
+            'next_cursor': encode_cursor(None, end - 1, dataset.version) if end < total else None
+        })
     
     start = (page - 1) * per_page
     end = start + per_page
     
-    total = len(OPPORTUNITIES)
+    total = len(opportunities)
     total_pages = (total + per_page - 1) // per_page
     
     return jsonify({
-        'data': OPPORTUNITIES[start:end],
+        'data': [project(r, fields) for r in opportunities[start:end]],
         'page': page,
         'per_page': per_page,
         'total': total,
         'total_pages': total_pages
     })
 
+@app.route('/api/opportunities/<notice_id>', methods=['GET'])
+@RESPONSE_CACHE.cached()
+def get_opportunity(notice_id):
+    """Full record for one opportunity (list endpoints return a projection)"""
+    dataset = LOADER.dataset
+    doc_id = dataset.find(notice_id)
+    if doc_id is None:
+        return jsonify({'error': 'Opportunity not found', 'noticeId': notice_id}), 404
+    return jsonify(project(dataset.records[doc_id], requested_fields() if 'fields' in request.args else None))
+
 @app.route('/api/search', methods=['GET'])
+# FTS results come from the database, not the in-memory dataset
+@RESPONSE_CACHE.cached(bypass=lambda: request.args.get('engine') == 'fts')
 def search():
-    """Search opportunities"""
+    """
+    Search opportunities through the inverted index.
+    Terms are ANDed, 'OR' separates alternatives, 'term*' is a prefix
+    match and the last term is always prefix-matched (search-as-you-type).
+    Results are ranked by relevance.
+    
+    With engine=fts the query runs against the SQLite FTS5 index in
+    sam_opportunities.db instead (BM25 ranking, highlighted snippets).
+    """
     search_type = request.args.get('type', 'keyword')
-    query = request.args.get('query', '').lower()
+    query = request.args.get('query', '')
     page = int(request.args.get('page', 1))
     per_page = int(request.args.get('per_page', 10))
+    fts = request.args.get('engine') == 'fts'
+    dataset = LOADER.dataset
     
-    results = []
-    
-    if search_type == 'keyword':
-        results = [o for o in OPPORTUNITIES 
-                  if query in o.get('title', '').lower()]
+    try:
+        # FTS cursors key on database row ids, which reloads don't change
+        after = decode_cursor(request.args.get('cursor'), None if fts else dataset.version)
+    except ValueError as e:
+        return cursor_error(e)
+    
+    if fts:
+        return search_fts_endpoint(search_type, query, page, per_page, after)
+    
+    fields = requested_fields()
+    
+    if 'cursor' in request.args:
+        # Keyset paging: only this page is selected from the ranked matches
+        hits, total, has_more = [], 0, False
+        if search_type in SEARCH_FIELDS:
+            hits, total, has_more = dataset.index.search_page(
+                query, fields=SEARCH_FIELDS[search_type], prefix_last=True,
+                after=after, limit=per_page)
+        return jsonify({
+            'data': [project(dataset.records[doc_id], fields) for doc_id, _ in hits],
+            'page': page,
+            'per_page': per_page,
+            'total': total,
+            'total_pages': (total + per_page - 1) // per_page,
+            'next_cursor': encode_cursor(hits[-1][1], hits[-1][0], dataset.version) if has_more else None,
+            'query': query,
+            'search_type': search_type
+        })
     
-    elif search_type == 'naics':
-        results = [o for o in OPPORTUNITIES 
-                  if query in str(o.get('naicsCode', '')).lower() or
-                     query in str(o.get('naicsCodes', '')).lower()]
+    doc_ids = []
     
-    elif search_type == 'organization':
-        org_fields = ['organizationType', 'fullParentPathName', 'officeAddress']
-        results = []
-        for o in OPPORTUNITIES:
-            for field in org_fields:
-                if query in str(o.get(field, '')).lower():
-                    if o not in results:
-                        results.append(o)
-                    break
+    if search_type in SEARCH_FIELDS:
+        doc_ids = dataset.index.search(query, fields=SEARCH_FIELDS[search_type], prefix_last=True)
     
-    total = len(results)
+    total = len(doc_ids)
     total_pages = (total + per_page - 1) // per_page
     
     start = (page - 1) * per_page
     end = start + per_page
     
     return jsonify({
-        'data': results[start:end],
+        'data': [project(dataset.records[doc_id], fields) for doc_id in doc_ids[start:end]],
         'page': page,
         'per_page': per_page,
         'total': total,
@@ -110,21 +254,175 @@ def search():
         'search_type': search_type
     })
 
+def search_fts_endpoint(search_type, query, page, per_page, after=None):
+    """/api/search?engine=fts: page through the on-disk FTS5 index"""
+    from fts_search import fts_available, search_fts
+    
+    if not fts_available():
+        return jsonify({'error': 'Full-text index not available. Run main.py to build the database.'}), 503
+    
+    keyset = 'cursor' in request.args
+    rows, total = search_fts(query, columns=FTS_SEARCH_COLUMNS.get(search_type),
+                             limit=per_page + 1 if keyset else per_page,
+                             offset=0 if keyset else (page - 1) * per_page,
+                             after=after, prefix_last=True)
+    
+    next_cursor = None
+    if keyset and len(rows) > per_page:
+        rows = rows[:per_page]
+        next_cursor = encode_cursor(rows[-1]['rank'], rows[-1]['id'])
+    
+    return jsonify({
+        'data': rows,
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'total_pages': (total + per_page - 1) // per_page,
+        'next_cursor': next_cursor,
+        'query': query,
+        'search_type': search_type,
+        'engine': 'fts'
+    })
+
+@app.route('/api/facets', methods=['GET'])
+@RESPONSE_CACHE.cached()
+def get_facets():
+    """
+    Counts by agency, NAICS, set-aside, notice type, RFI/RFQ/RFP class and
+    posted week for any combination of filters, e.g.
+    /api/facets?agency=GENERAL SERVICES ADMINISTRATION&document_class=RFP&naics=541512
+    
+    Repeat a parameter to accept several values of one facet. An optional
+    query= (same syntax as /api/search) narrows the set first. Also returns
+    one page of the matching opportunities.
+    """
+    from facet_index import FACETS, bitmap_from_ids, ids_from_bitmap
+    
+    dataset = LOADER.dataset
+    try:
+        page = int(request.args.get('page', 1))
+        per_page = int(request.args.get('per_page', 10))
+        limit = int(request.args.get('limit', 20))
+    except ValueError:
+        return jsonify({'error': 'page, per_page and limit must be integers'}), 400
+    if page < 1 or per_page < 1 or limit < 0:
+        return jsonify({'error': 'page and per_page must be at least 1 and limit at least 0'}), 400
+    filters = {name: request.args.getlist(name) for name in FACETS if name in request.args}
+    
+    base = None
+    query = request.args.get('query', '').strip()
+    if query:
+        base = bitmap_from_ids(dataset.index.search(query, prefix_last=True))
+    
+    result = dataset.facets.counts(filters, base=base, limit=limit)
+    
+    start = (page - 1) * per_page
+    doc_ids = ids_from_bitmap(dataset.facets.match(filters, base=base))[start:start + per_page]
+    
+    return jsonify({
+        'total': result['total'],
+        'facets': result['facets'],
+        'filters': filters,
+        'data': [project(dataset.records[doc_id], requested_fields()) for doc_id in doc_ids],
+        'page': page,
+        'per_page': per_page,
+        'total_pages': (result['total'] + per_page - 1) // per_page
+    })
+
 @app.route('/api/columns', methods=['GET'])
+@RESPONSE_CACHE.cached()
 def get_columns():
     """Get all available columns"""
+    columns = LOADER.dataset.columns
     return jsonify({
-        'columns': ALL_COLUMNS,
-        'total': len(ALL_COLUMNS)
+        'columns': columns,
+        'total': len(columns)
     })
 
 @app.route('/api/stats', methods=['GET'])
+@RESPONSE_CACHE.cached()
 def get_stats():
     """Get data statistics"""
+    dataset = LOADER.dataset
+    return jsonify({
+        'total_opportunities': len(dataset.records),
+        'total_columns': len(dataset.columns),
+        'data_files': len(list(Path('data').glob('*.csv'))) if Path('data').exists() else 0,
+        'data_version': dataset.version,
+        'loaded_at': dataset.loaded_at
+    })
+
+@app.route('/api/stats/analytics', methods=['GET'])
+@RESPONSE_CACHE.cached()
+def get_analytics():
+    """
+    RFI/RFQ/RFP counts, document type breakdowns by agency, NAICS and
+    set-aside, and weekly posting volumes with a rolling total, e.g.
+    /api/stats/analytics?by=agency&by=naics&limit=10&window=4
+    
+    Accepts the same facet filters as /api/facets (agency=, naics=, ...).
+    """
+    from analytics import FACET_COLUMNS
+    from facet_index import FACETS
+    
+    dataset = LOADER.dataset
+    try:
+        limit = int(request.args.get('limit', 10))
+        window = int(request.args.get('window', 4))
+    except ValueError:
+        return jsonify({'error': 'limit and window must be integers'}), 400
+    if limit < 0 or window < 1:
+        return jsonify({'error': 'limit must be at least 0 and window at least 1'}), 400
+    by = [column for column in request.args.getlist('by') if column in FACET_COLUMNS] or ['agency', 'naics', 'set_aside']
+    filters = {name: request.args.getlist(name) for name in FACETS if name in request.args}
+    
+    frame = dataset.analytics()
+    if filters:
+        frame = frame.select(dataset.facets.match(filters))
+    
+    return jsonify({
+        **frame.summary(by=by, limit=limit, window=window),
+        'filters': filters,
+        'data_version': dataset.version
+    })
+
+@app.route('/api/reload', methods=['POST'])
+def reload_data():
+    """Pick up new or changed data files now instead of waiting for the next poll"""
+    if MASTER_PID:
+        # SIGHUP: the master reloads the data, then gracefully replaces the workers
+        os.kill(MASTER_PID, signal.SIGHUP)
+        return jsonify({'reloading': True, 'data_version': LOADER.dataset.version}), 202
+    
+    changed = LOADER.refresh()
+    dataset = LOADER.dataset
     return jsonify({
-        'total_opportunities': len(OPPORTUNITIES),
-        'total_columns': len(ALL_COLUMNS),
-        'data_files': len(list(Path('data').glob('*.csv'))) if Path('data').exists() else 0
+        'changed': changed,
+        'total_opportunities': len(dataset.records),
+        'data_version': dataset.version
+    })
+
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    """Liveness: the process is serving requests"""
+    return jsonify({'status': 'ok', 'pid': os.getpid()})
+
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    """
+    Readiness: the data version being served and the size of its indexes.
+    The data is loaded and indexed at import, before the server accepts
+    connections, so any process that answers is ready.
+    """
+    dataset = LOADER.dataset
+    return jsonify({
+        'ready': True,
+        'pid': os.getpid(),
+        'data_version': dataset.version,
+        'loaded_at': dataset.loaded_at,
+        'total_opportunities': len(dataset.records),
+        'search_index_documents': dataset.index.doc_count,
+        'facet_index_documents': dataset.facets.doc_count
     })
 
 @app.route('/api/documents/<solicitation_number>', methods=['GET'])
@@ -234,7 +532,10 @@ def download_document(filename):
 
 @app.route('/api/download-docs', methods=['POST'])
 def download_docs():
-    """Download documents from SAM.gov for an opportunity"""
+    """
+    Queue a SAM.gov document download for an opportunity.
+    Returns 202 with a job_id; poll /api/jobs/<job_id> for progress and the result.
+    """
     try:
         data = request.get_json()
         # Handle both direct opportunity object and wrapped format
@@ -247,10 +548,6 @@ def download_docs():
                 'message': 'Missing opportunity data in request'
             }), 400
         
-        # Import and use DocumentDownloader
-        from document_downloader import DocumentDownloader
-        from config import API_KEY
-        
         solicitation_number = opportunity.get('solicitationNumber', '')
         if not solicitation_number:
             return jsonify({
@@ -259,71 +556,95 @@ def download_docs():
                 'message': 'The opportunity must have a solicitationNumber'
             }), 400
         
-        # Initialize downloader
-        downloader = DocumentDownloader(output_dir='downloaded_docs', api_key=API_KEY)
-        
-        # Fetch detailed opportunity info from SAM.gov
-        try:
-            print(f"[DEBUG] Fetching opportunity details for: {solicitation_number}")
-            opp_details = downloader.get_opportunity_details(solicitation_number)
-            
-            if not opp_details:
-                return jsonify({
-                    'success': False,
-                    'message': 'Could not fetch opportunity details from SAM.gov. The solicitation number may be invalid or the opportunity may no longer be available.',
-                    'solicitation': solicitation_number,
-                    'debug': 'get_opportunity_details returned None'
-                }), 400
-            
-            print(f"[DEBUG] Successfully fetched details for {solicitation_number}")
-            
-            # Save description
-            desc_saved = downloader.save_description(opp_details)
-            print(f"[DEBUG] Description saved: {desc_saved}")
-            
-            # Try to download attachments if they exist
-            attachments_downloaded = 0
-            if 'attachments' in opp_details and opp_details['attachments']:
-                print(f"[DEBUG] Found {len(opp_details['attachments'])} attachments")
-                for attachment in opp_details.get('attachments', []):
-                    if 'url' in attachment:
-                        filename = attachment.get('filename', f"attachment_{attachments_downloaded}")
-                        if downloader.download_attachment(attachment['url'], solicitation_number, filename):
-                            attachments_downloaded += 1
-                            print(f"[DEBUG] Downloaded attachment: {filename}")
-            
-            # Save download log
-            downloader.save_download_log()
-            
-            print(f"[DEBUG] Download complete for {solicitation_number}: {attachments_downloaded} attachments")
+        job = JOBS.submit('download-docs', run_download_job, opportunity)
+        return job_accepted(job)
             
-            return jsonify({
-                'success': True,
-                'message': f'Successfully downloaded documents for {solicitation_number}',
-                'solicitation': solicitation_number,
-                'description_saved': desc_saved,
-                'attachments_downloaded': attachments_downloaded,
-                'log_location': 'downloaded_docs/download_log.json'
-            })
-            
-        except Exception as e:
-            import traceback
-            print(f"[ERROR] Exception in download_docs: {str(e)}")
-            print(traceback.format_exc())
-            return jsonify({
+    except Exception as e:
+        return jsonify({'error': str(e), 'message': 'Failed to process download request'}), 500
+
+def run_download_job(job, opportunity):
+    """Background part of /api/download-docs: fetch details, save description, download attachments"""
+    # Import and use DocumentDownloader
+    from document_downloader import DocumentDownloader
+    from config import API_KEY
+    
+    solicitation_number = opportunity.get('solicitationNumber', '')
+    
+    # Initialize downloader
+    downloader = DocumentDownloader(output_dir='downloaded_docs', api_key=API_KEY)
+    
+    # Fetch detailed opportunity info from SAM.gov
+    try:
+        print(f"[DEBUG] Fetching opportunity details for: {solicitation_number}")
+        job.update(done=0, total=2, message='Fetching opportunity details from SAM.gov')
+        from sam_async import AIOHTTP_AVAILABLE, fetch_opportunity_details
+        if AIOHTTP_AVAILABLE:
+            # Multiplexed on the shared event loop instead of blocking a socket per request
+            opp_details = fetch_opportunity_details(solicitation_number)
+        else:
+            opp_details = downloader.get_opportunity_details(solicitation_number)
+        
+        if not opp_details:
+            return {
                 'success': False,
-                'error': str(e),
-                'message': f'Error downloading from SAM.gov: {str(e)}',
+                'message': 'Could not fetch opportunity details from SAM.gov. The solicitation number may be invalid or the opportunity may no longer be available.',
                 'solicitation': solicitation_number,
-                'debug': traceback.format_exc()
-            }), 500
-            
+                'debug': 'get_opportunity_details returned None'
+            }
+        
+        print(f"[DEBUG] Successfully fetched details for {solicitation_number}")
+        
+        attachments = [a for a in opp_details.get('attachments') or [] if 'url' in a]
+        job.update(done=1, total=2 + len(attachments), message='Saving description')
+        
+        # Save description
+        desc_saved = downloader.save_description(opp_details)
+        print(f"[DEBUG] Description saved: {desc_saved}")
+        
+        # Try to download attachments if they exist
+        attachments_downloaded = 0
+        if attachments:
+            print(f"[DEBUG] Found {len(attachments)} attachments")
+            for idx, attachment in enumerate(attachments):
+                filename = attachment.get('filename', f"attachment_{attachments_downloaded}")
+                job.update(done=2 + idx, message=f'Downloading {filename}')
+                if downloader.download_attachment(attachment['url'], solicitation_number, filename):
+                    attachments_downloaded += 1
+                    print(f"[DEBUG] Downloaded attachment: {filename}")
+        
+        # Save download log
+        downloader.save_download_log()
+        job.update(done=2 + len(attachments))
+        
+        print(f"[DEBUG] Download complete for {solicitation_number}: {attachments_downloaded} attachments")
+        
+        return {
+            'success': True,
+            'message': f'Successfully downloaded documents for {solicitation_number}',
+            'solicitation': solicitation_number,
+            'description_saved': desc_saved,
+            'attachments_downloaded': attachments_downloaded,
+            'log_location': 'downloaded_docs/download_log.json'
+        }
+        
     except Exception as e:
-        return jsonify({'error': str(e), 'message': 'Failed to process download request'}), 500
+        import traceback
+        print(f"[ERROR] Exception in download_docs: {str(e)}")
+        print(traceback.format_exc())
+        return {
+            'success': False,
+            'error': str(e),
+            'message': f'Error downloading from SAM.gov: {str(e)}',
+            'solicitation': solicitation_number,
+            'debug': traceback.format_exc()
+        }
 
 @app.route('/api/analyze', methods=['POST'])
 def analyze_opportunity():
-    """Analyze opportunity for bidding and generate guidance document"""
+    """
+    Queue a bidding analysis for an opportunity.
+    Returns 202 with a job_id; poll /api/jobs/<job_id> for the result.
+    """
     try:
         data = request.get_json()
         opportunity = data.get('opportunity', {})
@@ -331,34 +652,66 @@ def analyze_opportunity():
         if not opportunity:
             return jsonify({'error': 'No opportunity provided'}), 400
         
-        # Analyze the opportunity
-        analysis = analyze_for_bidding(opportunity)
-        
-        # Generate bidding document
-        bidding_doc = generate_bidding_document(opportunity, analysis)
-        
-        return jsonify({
-            'success': True,
-            'analysis': analysis,
-            'bidding_document': bidding_doc
-        })
+        job = JOBS.submit('analyze', run_analyze_job, opportunity)
+        return job_accepted(job)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def run_analyze_job(job, opportunity):
+    """Background part of /api/analyze"""
+    job.update(done=0, total=2, message='Analyzing opportunity')
+    # Analyze the opportunity
+    analysis = analyze_for_bidding(opportunity)
+    
+    job.update(done=1, message='Generating bidding document')
+    # Generate bidding document
+    bidding_doc = generate_bidding_document(opportunity, analysis)
+    job.update(done=2)
+    
+    return {
+        'success': True,
+        'analysis': analysis,
+        'bidding_document': bidding_doc
+    }
+
+def job_accepted(job):
+    """202 response pointing the client at the job's status URL"""
+    return jsonify({
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': f'/api/jobs/{job.id}'
+    }), 202
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """Recent background jobs, newest first"""
+    jobs = JOBS.list(limit=int(request.args.get('limit', 50)))
+    return jsonify({'jobs': jobs, 'total': len(jobs)})
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Status, progress and (once finished) result of a background job"""
+    job = JOBS.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found or expired', 'job_id': job_id}), 404
+    return jsonify(job)
+
+DOCUMENT_TYPE_NAMES = {
+    "RFI": "RFI (Request for Information)",
+    "RFQ": "RFQ (Request for Quote)",
+    "RFP": "RFP (Request for Proposal)",
+}
+
+
 def analyze_for_bidding(opportunity):
     """Analyze opportunity for RFI/RFQ/RFP type and bidding requirements"""
     title = opportunity.get('title', '').lower()
     description = opportunity.get('description', '').lower()
     combined_text = f"{title} {description}"
     
-    # Detect document type
-    doc_type = "Solicitation"
-    if any(kw in combined_text for kw in ['rfi', 'request for information']):
-        doc_type = "RFI (Request for Information)"
-    elif any(kw in combined_text for kw in ['rfq', 'request for quote', 'quotation']):
-        doc_type = "RFQ (Request for Quote)"
-    elif any(kw in combined_text for kw in ['rfp', 'request for proposal']):
-        doc_type = "RFP (Request for Proposal)"
+    # Detect document type (same rules as the checker and the stored column)
+    found_type, _ = classify_document(opportunity.get('title'), opportunity.get('description'))
+    doc_type = DOCUMENT_TYPE_NAMES.get(found_type, "Solicitation")
     
     # Extract key information
     solicitation_number = opportunity.get('solicitationNumber', 'N/A')
@@ -564,8 +917,11 @@ Timeline: {analysis['days_until_deadline']} to complete response
     return doc
 
 if __name__ == "__main__":
-    print(f"✓ Loaded {len(OPPORTUNITIES)} opportunities from CSV files")
-    print(f"✓ {len(ALL_COLUMNS)} columns available")
+    print(f"✓ Loaded {len(LOADER.dataset.records)} opportunities from CSV files")
+    print(f"✓ {len(LOADER.dataset.columns)} columns available")
+    # Poll data/ so new batches from main.py show up without a restart
+    LOADER.start()
+    # Development server; see wsgi.py for multi-worker production serving
     print(f"\n🌐 Starting web server on http://localhost:5000")
     print(f"📊 Open your browser and go to http://localhost:5000")
     app.run(debug=True, port=5000)
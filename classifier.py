@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+"""
+Keyword classifier for RFI/RFQ/RFP detection
+Rules compiled once into a priority-ordered keyword table
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence, Tuple
+
+from config import CLASSIFY_BATCH_SIZE
+
+# Keywords to identify document types, in precedence order (RFP first as
+# it's most common). RFIRFQRFPChecker exposes these as class attributes.
+RFI_KEYWORDS = ["rfi", "request for information", "information request"]
+RFQ_KEYWORDS = ["rfq", "request for quote", "request for quotation", "quotation"]
+RFP_KEYWORDS = ["rfp", "request for proposal", "proposal request"]
+
+DOCUMENT_RULES = [("RFP", RFP_KEYWORDS), ("RFQ", RFQ_KEYWORDS), ("RFI", RFI_KEYWORDS)]
+
+# Stored with each classified row in the opportunities table. Bump it when
+# the keywords or rules change, and stale rows are re-classified by
+# storage.reclassify_stale() on the next init_db()/save_db().
+CLASSIFIER_VERSION = 1
+
+
+class KeywordClassifier:
+    """
+    Classify text by the highest-priority keyword it contains.
+
+    rules is an ordered list of (label, keywords): a keyword of an earlier
+    rule beats any keyword of a later one, and within a rule the earlier
+    keyword wins. Matching is case-insensitive substring matching.
+
+    The text is lower-cased once and the keyword table is tried in priority
+    order, stopping at the first hit. CPython's substring search is a
+    C-level two-way/bloom-filter scan; on typical description lengths ten
+    of those beat both a combined regex alternation (2-3x slower) and a
+    pure-Python Aho-Corasick automaton, so the savings come from callers
+    classifying each record only once (see RFIRFQRFPChecker.classify).
+    """
+
+    def __init__(self, rules: Sequence[Tuple[str, Sequence[str]]], default: str = "Solicitation"):
+        self.rules = [(label, list(keywords)) for label, keywords in rules]
+        self.default = default
+        # (keyword, label, reported keyword) in priority order
+        self._table = [(keyword.lower(), label, keyword.upper())
+                       for label, keywords in self.rules for keyword in keywords]
+
+    def classify(self, text: str) -> Tuple[str, str]:
+        """Return (label, matched keyword upper-cased), or (default, "") if nothing matches"""
+        if not text:
+            return ("Unknown", "")
+
+        text = text.lower()
+        for keyword, label, reported in self._table:
+            if keyword in text:
+                return (label, reported)
+        return (self.default, "")
+
+
+DOCUMENT_CLASSIFIER = KeywordClassifier(DOCUMENT_RULES)
+
+
+def document_text(title, description) -> str:
+    """The text an opportunity is classified by"""
+    return f"{title or ''} {description or ''}"
+
+
+def classify_document(title, description) -> Tuple[str, str]:
+    """
+    (document_type, keyword) for an opportunity's title and description.
+    The single source of truth for the checker, the stored
+    opportunities.document_type column and the bidding analysis.
+    """
+    return DOCUMENT_CLASSIFIER.classify(document_text(title, description))
+
+
+# Per-process classifiers and pools for classify_many()
+_worker_classifiers: Dict[tuple, KeywordClassifier] = {}
+_pools: Dict[int, ProcessPoolExecutor] = {}
+
+
+def _frozen(rules) -> tuple:
+    return tuple((label, tuple(keywords)) for label, keywords in rules)
+
+
+def _classify_batch(rules: tuple, default: str, texts: List[str]) -> List[Tuple[str, str]]:
+    """Runs in a pool worker; the classifier is built once per worker process"""
+    compiled = _worker_classifiers.get((rules, default))
+    if compiled is None:
+        compiled = _worker_classifiers[(rules, default)] = KeywordClassifier(rules, default)
+    return [compiled.classify(text) for text in texts]
+
+
+def worker_count(workers) -> int:
+    """Process count for a workers setting (0 or None: one per CPU)"""
+    return workers if workers is not None and workers > 0 else os.cpu_count() or 1
+
+
+def _pool(workers: int) -> ProcessPoolExecutor:
+    if workers not in _pools:
+        _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+    return _pools[workers]
+
+
+def classify_many(texts: Sequence[str], rules=DOCUMENT_RULES, default: str = "Solicitation",
+                  workers: int = 1, batch_size: int = CLASSIFY_BATCH_SIZE) -> List[Tuple[str, str]]:
+    """
+    KeywordClassifier(rules, default).classify() of every text, in order.
+
+    With workers > 1 (0 or None: one per CPU) the texts are cut into
+    batch_size batches that are classified on a process pool, which is
+    kept for later calls. Results come back in input order, so the output
+    is identical to the serial path.
+    """
+    workers = worker_count(workers)
+    if workers == 1 or len(texts) <= batch_size:
+        return _classify_batch(_frozen(rules), default, list(texts))
+
+    frozen = _frozen(rules)
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    futures = [_pool(workers).submit(_classify_batch, frozen, default, list(batch)) for batch in batches]
+    results = []
+    for future in futures:
+        results.extend(future.result())
+    return results
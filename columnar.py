@@ -0,0 +1,287 @@
+#!/usr/bin/env python
+"""
+Columnar (Arrow IPC / Parquet) snapshots of opportunity data
+Written alongside or instead of the CSV files, loaded via memory-mapping
+"""
+
+import csv
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = ipc = pq = None
+    PYARROW_AVAILABLE = False
+
+from storage import SAM_CSV_FIELDS, _flatten
+
+
+def _require_pyarrow():
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow is required for columnar snapshots (pip install pyarrow)")
+
+
+# Schema metadata keys. A converted CSV's snapshot records the file and its
+# size at conversion, so it replaces exactly that CSV; a snapshot written
+# next to the CSV sink (SNAPSHOT_FORMAT = "both") is marked as a mirror.
+CSV_SOURCE = b"csv_source"
+CSV_SIZE = b"csv_size"
+MIRRORS_CSV = b"mirrors_csv"
+
+
+def _cell(value) -> str:
+    """Same cell text the CSV sink writes, so both formats read back identically"""
+    value = _flatten(value)
+    return value if isinstance(value, str) else str(value)
+
+
+class ArrowSink:
+    """
+    Streaming Arrow IPC writer with the same interface as storage.CSVSink.
+
+    Each write_batch call becomes one record batch in the file. All columns
+    are strings with '' for missing values, matching what csv.DictReader
+    returns for the CSV files. Arrow IPC files can be memory-mapped, so
+    loaders only page in the columns they read.
+
+    mirrors_csv=True marks the file as a copy of rows also written to the
+    CSV sink, so data_files() doesn't load them twice.
+    """
+
+    def __init__(self, directory, prefix="sam_results_extended", fieldnames=None, rotate_daily=True,
+                 mirrors_csv=False, metadata: Optional[Dict[bytes, bytes]] = None):
+        _require_pyarrow()
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fieldnames = list(fieldnames or SAM_CSV_FIELDS)
+        metadata = dict(metadata or {})
+        if mirrors_csv:
+            metadata[MIRRORS_CSV] = b"1"
+        self.schema = pa.schema([(name, pa.string()) for name in self.fieldnames], metadata=metadata or None)
+
+        stem = prefix + (f"_{datetime.now().strftime('%Y%m%d')}" if rotate_daily else "")
+        self.path = self._next_free(stem)
+        self.writer = None
+        self.records_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _next_free(self, stem):
+        """IPC files can't be appended to once closed, so each run gets a new part"""
+        path = self.directory / f"{stem}.arrow"
+        part = 0
+        while path.exists():
+            part += 1
+            path = self.directory / f"{stem}_{part}.arrow"
+        return path
+
+    def write_batch(self, records: List[Dict]) -> int:
+        """Append a batch of records as one record batch; returns the number written"""
+        if not records:
+            return 0
+        if self.writer is None:
+            self.writer = ipc.new_file(str(self.path), self.schema)
+
+        arrays = [pa.array([_cell(r.get(name)) for r in records], type=pa.string())
+                  for name in self.fieldnames]
+        self.writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        self.records_written += len(records)
+        return len(records)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.writer = None
+
+
+def snapshot_files(directory) -> List[Path]:
+    """Arrow and Parquet snapshot files in a directory, oldest name first"""
+    directory = Path(directory)
+    if not directory.exists():
+        return []
+    return sorted(list(directory.glob("*.arrow")) + list(directory.glob("*.parquet")))
+
+
+def has_snapshots(directory) -> bool:
+    return PYARROW_AVAILABLE and bool(snapshot_files(directory))
+
+
+def _snapshot_metadata(path: Path) -> Dict[bytes, bytes]:
+    try:
+        if path.suffix == ".parquet":
+            schema = pq.read_schema(path)
+        else:
+            schema = ipc.open_file(pa.memory_map(str(path), "r")).schema
+    except (OSError, pa.ArrowInvalid):
+        # Still being written; the loader reports it and retries
+        return {}
+    return schema.metadata or {}
+
+
+def data_files(directory) -> List[Path]:
+    """
+    Files to load from a data directory, by name, each row once:
+
+    - a CSV converted by convert_csv_dir() is replaced by its snapshot,
+      unless the CSV has changed since (then the stale snapshot is skipped)
+    - snapshots mirroring the CSV sink are skipped while there are CSVs
+      (or conversions of them)
+    - other snapshots (when pyarrow is available) and CSVs are all loaded
+    """
+    directory = Path(directory)
+    if not directory.exists():
+        return []
+    csvs = {path.name: path for path in directory.glob("*.csv")}
+    snapshots = {path: _snapshot_metadata(path) for path in (snapshot_files(directory) if PYARROW_AVAILABLE else [])}
+    have_csv_rows = bool(csvs) or any(CSV_SOURCE in metadata for metadata in snapshots.values())
+    files = []
+    for path, metadata in snapshots.items():
+        if metadata.get(MIRRORS_CSV) and have_csv_rows:
+            continue
+        source = csvs.get(metadata.get(CSV_SOURCE, b"").decode())
+        if source is not None:
+            if source.stat().st_size != int(metadata.get(CSV_SIZE, -1)):
+                continue
+            del csvs[source.name]
+        files.append(path)
+    return sorted(files + list(csvs.values()))
+
+
+def _read_file(path: Path, columns: Optional[List[str]]):
+    if path.suffix == ".parquet":
+        return pq.read_table(path, columns=columns, memory_map=True)
+
+    # Zero-copy: buffers point into the mapping, so unselected columns
+    # are never read from disk
+    table = ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    if columns is not None:
+        table = table.select([c for c in columns if c in table.column_names])
+    return table
+
+
+def load_table(directory, columns: Optional[List[str]] = None):
+    """
+    Load every snapshot in a directory as one Arrow table.
+
+    Args:
+        directory: Folder containing .arrow / .parquet snapshots
+        columns: Only materialize these columns (default: all)
+    """
+    _require_pyarrow()
+    tables = [_read_file(path, columns) for path in snapshot_files(directory)]
+    if not tables:
+        return pa.table({})
+    return pa.concat_tables(tables, promote_options="default")
+
+
+def _column_values(table, name) -> List[str]:
+    """One column as Python strings ('' for missing values, like csv.DictReader)"""
+    return ["" if value is None else value for value in table.column(name).to_pylist()]
+
+
+def _to_records(table) -> List[Dict]:
+    # Column by column: much cheaper than table.to_pylist()'s dict per row
+    names = table.column_names
+    columns = [_column_values(table, name) for name in names]
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+def load_records(directory, columns: Optional[List[str]] = None) -> List[Dict]:
+    """Snapshot rows as a list of dicts ('' for missing values), like csv.DictReader"""
+    return _to_records(load_table(directory, columns))
+
+
+def load_file_records(path, columns: Optional[List[str]] = None) -> List[Dict]:
+    """Rows of a single snapshot file, in the same form as load_records"""
+    _require_pyarrow()
+    return _to_records(_read_file(Path(path), columns))
+
+
+def load_file_store(path, pool=None, columns: Optional[List[str]] = None):
+    """
+    A snapshot file as a record_store.RecordStore that converts each column
+    from the memory-mapped Arrow arrays on first access, so only the columns
+    a view actually reads are turned into Python objects.
+
+    Args:
+        path: .arrow or .parquet snapshot
+        pool: ValuePool shared with the other stores of the dataset
+        columns: Only expose these columns (default: all)
+    """
+    from record_store import RecordStore
+
+    _require_pyarrow()
+    table = _read_file(Path(path), columns)
+    return RecordStore.from_columns(
+        table.num_rows, {name: partial(_column_values, table, name) for name in table.column_names}, pool)
+
+
+def load_columns(directory) -> List[str]:
+    """Union of snapshot column names, read from file metadata only"""
+    _require_pyarrow()
+    names = set()
+    for path in snapshot_files(directory):
+        if path.suffix == ".parquet":
+            names.update(pq.read_schema(path).names)
+        else:
+            names.update(ipc.open_file(pa.memory_map(str(path), "r")).schema.names)
+    return sorted(names)
+
+
+def save_parquet(records: List[Dict], filename, fieldnames=None):
+    """Write records to a compressed Parquet file (for archival/exchange)"""
+    _require_pyarrow()
+    fieldnames = list(fieldnames or SAM_CSV_FIELDS)
+    table = pa.table({name: pa.array([_cell(r.get(name)) for r in records], type=pa.string())
+                      for name in fieldnames})
+    pq.write_table(table, filename, compression="zstd")
+    print(f"✓ Saved {len(records)} results to {filename}")
+
+
+def convert_csv_dir(directory):
+    """
+    Conversion of the CSV files in a directory to Arrow snapshots: X.csv
+    becomes X.csv.arrow, which data_files() then loads instead of the CSV.
+    Files converted since they last changed are skipped.
+    """
+    _require_pyarrow()
+    directory = Path(directory)
+    paths = []
+    for csv_file in sorted(directory.glob("*.csv")):
+        size = csv_file.stat().st_size
+        snapshot = directory / f"{csv_file.name}.arrow"
+        if snapshot.exists():
+            if int(_snapshot_metadata(snapshot).get(CSV_SIZE, -1)) == size:
+                continue
+            snapshot.unlink()
+        metadata = {CSV_SOURCE: csv_file.name.encode(), CSV_SIZE: str(size).encode()}
+        with open(csv_file, "r", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            columns = reader.fieldnames or []
+            fieldnames = [c for c in SAM_CSV_FIELDS if c in columns] + sorted(set(columns) - set(SAM_CSV_FIELDS))
+            with ArrowSink(directory, prefix=csv_file.name, fieldnames=fieldnames, rotate_daily=False,
+                           metadata=metadata) as sink:
+                sink.write_batch(list(reader))
+        if sink.records_written:
+            paths.append(sink.path)
+        print(f"  ✓ {csv_file.name}: {sink.records_written} records")
+
+    print(f"✓ Converted {len(paths)} CSV files")
+    return paths
+
+
+if __name__ == "__main__":
+    import sys
+
+    convert_csv_dir(sys.argv[1] if len(sys.argv) > 1 else "data")
@@ -2,9 +2,53 @@ API_KEY = "SAM-bbd10fc4-1f68-49d5-99cd-2ed52ac32fbe"
 
 DEFAULT_DAYS = 30
 DEFAULT_LIMIT = 100
+DEFAULT_WORKERS = 4
+
+# Shared HTTP transport (see http_client.py)
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = 10
+HTTP_POOL_BLOCK = True
+
+# SAM.gov rate limiting and retries (see throttle.py)
+RATE_LIMIT_PER_SECOND = 5
+RATE_LIMIT_BURST = 10
+RATE_LIMIT_RESERVE = 0.1
+MAX_RETRIES = 5
+RETRY_BACKOFF_BASE = 1.0
+RETRY_BACKOFF_MAX = 60
 
 DB_FILE = "sam_opportunities.db"
 CSV_FILE = "sam_results.csv"
+CSV_ROTATE_BYTES = 50 * 1024 * 1024
+# "csv", "arrow" or "both" (arrow needs pyarrow; see columnar.py)
+SNAPSHOT_FORMAT = "csv"
+DB_BATCH_SIZE = 5000
+# Rows per fetch when the RFI/RFQ/RFP checker streams from the database (lazy=True)
+CHECKER_CHUNK_SIZE = 2000
+# Processes for classifying RFI/RFQ/RFP text (1: in-process, 0: one per CPU)
+# and rows per batch sent to a worker; see classifier.classify_many()
+CLASSIFY_WORKERS = 1
+CLASSIFY_BATCH_SIZE = 5000
+SQLITE_CACHE_SIZE_KB = 65536
+SQLITE_MMAP_SIZE = 268435456
+
+# Seconds between api_server checks of data/ for new or changed files (0 = off)
+DATA_RELOAD_INTERVAL = 30
+# Serialized API responses kept per data version (see response_cache.py)
+RESPONSE_CACHE_SIZE = 256
+
+# Production serving (see wsgi.py / gunicorn.conf.py)
+API_HOST = "0.0.0.0"
+API_PORT = 5000
+API_WORKERS = 4
+API_THREADS = 8
+
+# Background jobs for document downloads and analysis (see jobs.py)
+JOB_WORKERS = 4
+JOB_RETENTION_SECONDS = 3600
+# How long a gunicorn worker being replaced (data reload, shutdown) waits
+# for its running jobs before it exits; unfinished ones are then failed
+JOB_DRAIN_SECONDS = 600
 
 EMAIL_FROM = "your_email@example.com"
 EMAIL_TO = "recipient@example.com"
@@ -11,6 +11,7 @@ import sys
 from pathlib import Path
 from typing import List, Dict
 from document_downloader import DocumentDownloader
+from record_store import ChainedRecords, RecordStore, ValuePool
 
 
 class ProjectDashboard:
@@ -28,6 +29,7 @@ class ProjectDashboard:
         self.selected = []
         self.all_columns = []  # Track all available columns
         self.display_columns = []  # Columns to display (key fields)
+        self.use_fts = False  # Keyword search via the SQLite FTS5 index
         self.load_opportunities()
         self._determine_display_columns()
     
@@ -47,44 +49,53 @@ class ProjectDashboard:
             self.display_columns = self.all_columns[:5]
     
     def load_opportunities(self):
-        """Load opportunities from all CSV files in the data directory"""
+        """Load opportunities from all CSV files (and columnar snapshots) in the data directory"""
         try:
             if not self.csv_dir.exists():
                 print(f"❌ Directory not found: {self.csv_dir}")
                 self.opportunities = []
                 return
             
-            csv_files = sorted(self.csv_dir.glob("*.csv"))
+            # Memory-mapped columnar snapshots where a file has one (no
+            # re-parsing every CSV row, and each column is only converted
+            # when the dashboard first reads it), the CSV file otherwise
+            from columnar import data_files, load_file_store
+            csv_files = data_files(self.csv_dir)
             
             if not csv_files:
                 print(f"❌ No CSV files found in: {self.csv_dir}")
                 self.opportunities = []
                 return
             
-            # Load all CSV files
+            # Load all files, each into a compact column store
             file_count = 0
+            pool = ValuePool()
+            stores = []
             for csv_file in csv_files:
                 try:
-                    with open(csv_file, 'r', encoding='utf-8') as f:
-                        reader = csv.DictReader(f)
-                        records = list(reader)
-                        
-                        # Track all unique columns across all files
-                        if records:
-                            self.all_columns = list(set(self.all_columns) | set(records[0].keys()))
-                        
-                        self.opportunities.extend(records)
-                        file_count += 1
-                        print(f"  ✓ {csv_file.name}: {len(records)} records")
+                    if csv_file.suffix != '.csv':
+                        store = load_file_store(csv_file, pool)
+                    else:
+                        with open(csv_file, 'r', encoding='utf-8') as f:
+                            store = RecordStore(csv.DictReader(f), pool)
+                    
+                    # Track all unique columns across all files
+                    self.all_columns = list(set(self.all_columns) | set(store.columns))
+                    
+                    stores.append(store)
+                    file_count += 1
+                    print(f"  ✓ {csv_file.name}: {len(store)} records")
                 
                 except Exception as e:
                     print(f"  ⚠ Error loading {csv_file.name}: {e}")
                     continue
             
+            self.opportunities = ChainedRecords(stores)
+            
             # Sort all columns alphabetically for consistent ordering
             self.all_columns.sort()
             
-            print(f"\n✓ Loaded {len(self.opportunities)} total opportunities from {file_count} CSV files")
+            print(f"\n✓ Loaded {len(self.opportunities)} total opportunities from {file_count} files")
             print(f"✓ Total columns available: {len(self.all_columns)}\n")
         
         except Exception as e:
@@ -208,11 +219,26 @@ class ProjectDashboard:
         
         return results
     
-    def search_by_keyword(self, keyword: str) -> List[Dict]:
-        """Search opportunities by title keyword"""
-        keyword_lower = keyword.lower()
-        results = [o for o in self.opportunities 
-                  if keyword_lower in o.get('title', '').lower()]
+    def search_by_keyword(self, keyword: str, use_fts: bool = False, limit: int = 50) -> List[Dict]:
+        """
+        Search opportunities by title keyword
+        
+        Args:
+            keyword: Text to look for
+            use_fts: Query the SQLite FTS5 index (title + description,
+                BM25-ranked) instead of scanning the loaded CSV rows
+            limit: Maximum FTS results to return
+        """
+        if use_fts:
+            from fts_search import search_fts
+            results, total = search_fts(keyword, columns=['title', 'description'], limit=limit)
+            for opp in results:
+                # Match the CSV field name used by _format_opportunity
+                opp.setdefault('naicsCode', opp.get('naics'))
+        else:
+            keyword_lower = keyword.lower()
+            results = [o for o in self.opportunities 
+                      if keyword_lower in o.get('title', '').lower()]
         
         print(f"\n{'='*80}")
         print(f"SEARCH RESULTS - Keyword: '{keyword}'")
@@ -339,7 +365,7 @@ class ProjectDashboard:
             
             elif choice == "4":
                 keyword = input("Enter keyword to search in title: ").strip()
-                results = self.search_by_keyword(keyword)
+                results = self.search_by_keyword(keyword, use_fts=self.use_fts)
                 if results:
                     try:
                         idx = int(input("Select opportunity number (0 to skip): ").strip())
@@ -372,4 +398,9 @@ class ProjectDashboard:
 if __name__ == "__main__":
     # Load from data folder
     dashboard = ProjectDashboard(csv_dir="data")
+    if "--fts" in sys.argv:
+        from fts_search import fts_available
+        dashboard.use_fts = fts_available()
+        if not dashboard.use_fts:
+            print("⚠ Full-text index not found in the database, using CSV keyword search")
     dashboard.run()
@@ -0,0 +1,286 @@
+#!/usr/bin/env python
+"""
+Hot-reloadable in-memory dataset for api_server
+Polls the data folder, ingests only new or changed files and swaps in a
+new immutable snapshot, so requests never see a half-built dataset
+"""
+
+import csv
+import io
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from analytics import OpportunityFrame
+from config import DATA_RELOAD_INTERVAL
+from facet_index import FacetIndex
+from record_store import ChainedRecords, RecordStore, ValuePool
+from search_index import InvertedIndex
+
+
+class Dataset:
+    """
+    One immutable version of the loaded data: records, column names, the
+    search index and the facet index over them (and, built on first use,
+    an analytics frame). Readers take a reference once per request
+    (loader.dataset) and use it throughout; reloads build a new Dataset
+    instead of modifying this one.
+    """
+
+    def __init__(self, records: ChainedRecords, columns: List[str], index: InvertedIndex,
+                 facets: FacetIndex, version: int = 0, loaded_at: Optional[str] = None):
+        self.records = records
+        self.columns = columns
+        self.index = index
+        self.facets = facets
+        self.version = version
+        self.loaded_at = loaded_at or datetime.now().isoformat()
+        self._by_notice_id = None
+        self._analytics = None
+
+    def find(self, notice_id: str) -> Optional[int]:
+        """Position of the record with this noticeId (lookup table built on first use)"""
+        if self._by_notice_id is None:
+            lookup = {}
+            for store_offset, store in zip(self.records.offsets, self.records.stores):
+                for row, value in enumerate(store.column("noticeId")):
+                    if value:
+                        lookup[value] = store_offset + row
+            self._by_notice_id = lookup
+        return self._by_notice_id.get(notice_id)
+
+    def analytics(self) -> OpportunityFrame:
+        """Analytics frame over the records, built from the facet index on first use"""
+        if self._analytics is None:
+            self._analytics = OpportunityFrame.from_facets(self.facets)
+        return self._analytics
+
+
+class _FileState:
+    """What has been ingested from one data file"""
+
+    def __init__(self, mtime_ns, size, stores, columns, offset=0, header=None, tail=b""):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        # One RecordStore per read: the whole file, then each appended tail
+        self.stores = stores
+        self.columns = columns
+        # CSV only: bytes parsed so far, the header and the bytes just before
+        # offset, for reading appended rows (and telling appends from rewrites)
+        self.offset = offset
+        self.header = header
+        self.tail = tail
+
+
+# Bytes before the parsed offset compared to detect a rewritten CSV
+_TAIL_BYTES = 4096
+
+
+def _csv_header(path: Path) -> List[str]:
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return next(csv.reader([f.readline()]), [])
+
+
+def _tail(path: Path, offset: int) -> bytes:
+    """The (up to) _TAIL_BYTES bytes before offset"""
+    start = max(0, offset - _TAIL_BYTES)
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(offset - start)
+
+
+def _record_end(data: bytes) -> int:
+    """
+    Length of the complete CSV records at the start of data: up to the
+    last newline outside a quoted field (quoted fields may span lines).
+    Works on the bytes, since '"' and '\\n' never occur inside a UTF-8
+    multi-byte character.
+    """
+    end = pos = 0
+    in_quotes = False
+    newline = data.find(b"\n")
+    while newline != -1:
+        # An escaped quote ("") toggles twice, so parity is enough
+        if data.count(b'"', pos, newline) & 1:
+            in_quotes = not in_quotes
+        if not in_quotes:
+            end = newline + 1
+        pos = newline + 1
+        newline = data.find(b"\n", pos)
+    return end
+
+
+def _read_csv(path: Path, offset: int = 0, header: Optional[List[str]] = None):
+    """
+    Parse complete CSV records from a byte offset onward.
+
+    Stops after the last complete record, so a record the writer is still
+    appending (possibly mid-way through a multi-line quoted field) is left
+    for the next poll. Returns (records, header, new offset).
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    end = _record_end(data)
+
+    reader = csv.DictReader(io.StringIO(data[:end].decode("utf-8"), newline=""), fieldnames=header)
+    if header is None:
+        header = reader.fieldnames or []
+    records = list(reader)
+    return records, header, offset + end
+
+
+class DataLoader:
+    """
+    Loads the Arrow/Parquet snapshots and the CSV files without a snapshot
+    in a data folder and keeps them current.
+
+    refresh() stats every file and only reads what changed: rows appended
+    to a CSV since the last poll are parsed from the previous end offset,
+    and new files are read whole. When the change is append-only the new
+    records go after the existing ones and the search index is extended
+    from a copy-on-write clone; if a file was rewritten or removed the
+    dataset is rebuilt from the per-file records already in memory, still
+    without re-parsing the unchanged files.
+    """
+
+    def __init__(self, data_dir="data", interval: float = DATA_RELOAD_INTERVAL):
+        self.data_dir = Path(data_dir)
+        self.interval = interval
+        self.dataset = Dataset(ChainedRecords(), [], InvertedIndex(), FacetIndex())
+        self._files: Dict[Path, _FileState] = {}
+        self._pool = ValuePool()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _data_files(self) -> List[Path]:
+        from columnar import data_files
+        return data_files(self.data_dir)
+
+    def _ingest(self, path: Path, stat, old: Optional[_FileState]):
+        """Return (new state, appended store) or (new state, None) if the file was rewritten"""
+        if path.suffix != ".csv":
+            from columnar import load_file_store
+            store = load_file_store(path, self._pool)
+            state = _FileState(stat.st_mtime_ns, stat.st_size, [store], store.columns)
+            return state, (store if old is None else None)
+
+        # Grown with the same header and the same bytes up to where we
+        # stopped parsing: the rolling CSV sink appended rows (a rewrite that
+        # happens to be bigger is read from scratch)
+        if (old is not None and stat.st_size > old.size and old.header and old.tail
+                and _csv_header(path) == old.header and _tail(path, old.offset) == old.tail):
+            records, header, offset = _read_csv(path, old.offset, old.header)
+            store = RecordStore(records, self._pool)
+            state = _FileState(stat.st_mtime_ns, stat.st_size, old.stores + [store],
+                               old.columns, offset, header, _tail(path, offset))
+            return state, store
+
+        records, header, offset = _read_csv(path)
+        store = RecordStore(records, self._pool)
+        state = _FileState(stat.st_mtime_ns, stat.st_size, [store], header, offset, header, _tail(path, offset))
+        return state, (store if old is None else None)
+
+    def refresh(self) -> bool:
+        """Ingest new or changed files and swap in a new Dataset; True if anything changed"""
+        with self._lock:
+            current = self.dataset
+            files = {}
+            appended = []  # new RecordStores, in file order
+            changed = rebuild = False
+
+            for path in self._data_files():
+                try:
+                    stat = path.stat()
+                    old = self._files.get(path)
+                    if old is not None and (old.mtime_ns, old.size) == (stat.st_mtime_ns, stat.st_size):
+                        files[path] = old
+                        continue
+                    state, new_store = self._ingest(path, stat, old)
+                except Exception as e:
+                    # Typically a snapshot still being written: keep what we had and retry next poll
+                    print(f"⚠ Skipping {path.name} this reload: {e}")
+                    if path in self._files:
+                        files[path] = self._files[path]
+                    continue
+
+                files[path] = state
+                changed = True
+                if new_store is None:
+                    rebuild = True
+                else:
+                    appended.append(new_store)
+
+            if any(path not in files for path in self._files):
+                rebuild = True
+            if not changed and not rebuild:
+                return False
+
+            columns = sorted({c for state in files.values() for c in state.columns})
+            if rebuild:
+                # Re-intern into a fresh pool, so values of rewritten and
+                # removed files are released with the old dataset
+                self._pool = ValuePool()
+                for state in files.values():
+                    state.stores = [store.with_pool(self._pool) for store in state.stores]
+                records = ChainedRecords(s for state in files.values() for s in state.stores)
+                index = InvertedIndex()
+                index.add_many(records)
+                facets = FacetIndex()
+                facets.add_many(records)
+            else:
+                records = current.records.extended(appended)
+                new_records = records[len(current.records):]
+                index = current.index.copy()
+                index.add_many(new_records, start_id=len(current.records))
+                facets = current.facets.copy()
+                facets.add_many(new_records, start_id=len(current.records))
+
+            self._files = files
+            # Single reference assignment: readers see the old or the new dataset, never a mix
+            self.dataset = Dataset(records, columns, index, facets, current.version + 1)
+            return True
+
+    def file_signature(self) -> Tuple:
+        """
+        (path, mtime, size) of the data files: only stat calls and no lock,
+        so it is safe to call from a signal handler (see gunicorn.conf.py)
+        """
+        signature = []
+        for path in self._data_files():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def start(self, on_change=None):
+        """
+        Poll for changes every `interval` seconds on a daemon thread.
+        on_change, if given, is called after each reload that changed the data.
+        """
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(on_change,), name="data-reload", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._thread = None
+
+    def _run(self, on_change):
+        while not self._stop.wait(self.interval):
+            try:
+                if self.refresh():
+                    print(f"✓ Reloaded data: {len(self.dataset.records)} opportunities "
+                          f"(version {self.dataset.version})")
+                    if on_change is not None:
+                        on_change()
+            except Exception as e:
+                print(f"⚠ Data reload failed: {e}")
@@ -6,12 +6,13 @@ Downloads opportunity descriptions and related documents
 
 import os
 import sys
-import requests
 import json
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Optional
 
+import http_client
+
 class DocumentDownloader:
     """Downloads documents and descriptions from SAM.gov opportunities"""
     
@@ -31,10 +32,11 @@ class DocumentDownloader:
         self.descriptions_dir.mkdir(exist_ok=True)
         self.attachments_dir.mkdir(exist_ok=True)
         
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Pooled keep-alive session shared with the rest of the pipeline
+        self.session = http_client.get_session()
+        self.headers = {
             'User-Agent': 'SAM-Document-Downloader/1.0'
-        })
+        }
         
         self.download_log = {
             'timestamp': datetime.now().isoformat(),
@@ -57,7 +59,7 @@ class DocumentDownloader:
                 "solicitationNumber": solicitation_number
             }
             
-            response = self.session.get(url, params=params, timeout=10)
+            response = http_client.get(url, params=params, headers=self.headers, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -145,7 +147,7 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         Download a single attachment
         """
         try:
-            response = self.session.get(url, timeout=30, stream=True)
+            response = http_client.get(url, headers=self.headers, timeout=30, stream=True)
             
             if response.status_code == 200:
                 # Create subdirectory for each opportunity
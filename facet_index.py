@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+"""
+Precomputed facet indexes over opportunity records
+A bitmap or id array per facet value, so filtering and counting are set intersections
+"""
+
+from array import array
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Union
+
+from classifier import classify_document
+from storage import normalize_posted_date
+
+
+def _agency(record):
+    # fullParentPathName is "DEPARTMENT.SUB-AGENCY.OFFICE"; facet on the department
+    path = record.get("fullParentPathName") or record.get("agency")
+    return path.split(".")[0].strip() if path else None
+
+
+def _naics(record):
+    return record.get("naicsCode") or record.get("naics")
+
+
+def _set_aside(record):
+    return record.get("typeOfSetAsideDescription") or record.get("typeOfSetAside")
+
+
+def _notice_type(record):
+    return record.get("type")
+
+
+def _document_class(record):
+    return classify_document(record.get("title"), record.get("description"))[0]
+
+
+def _posted_week(record):
+    return week_of(record.get("postedDate"))
+
+
+@lru_cache(maxsize=4096)
+def week_of(posted_date):
+    """Monday of the posting week, as YYYY-MM-DD (few distinct dates, so cached)"""
+    posted = normalize_posted_date(posted_date)
+    if not posted:
+        return None
+    day = datetime.strptime(posted, "%Y-%m-%d")
+    return (day - timedelta(days=day.weekday())).strftime("%Y-%m-%d")
+
+
+# Facet name -> function extracting the record's value (None = not counted)
+FACETS = {
+    "agency": _agency,
+    "naics": _naics,
+    "set_aside": _set_aside,
+    "notice_type": _notice_type,
+    "document_class": _document_class,
+    "posted_week": _posted_week,
+}
+
+
+def bitmap_from_ids(doc_ids: Iterable[int]) -> int:
+    """Bitmap (an int with bit i set for doc i) from a collection of doc ids"""
+    doc_ids = list(doc_ids)
+    if not doc_ids:
+        return 0
+    bits = bytearray(max(doc_ids) // 8 + 1)
+    for doc_id in doc_ids:
+        bits[doc_id >> 3] |= 1 << (doc_id & 7)
+    return int.from_bytes(bits, "little")
+
+
+def ids_from_bitmap(bitmap: int) -> List[int]:
+    """Doc ids set in a bitmap, ascending"""
+    ids = []
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    for byte_index, byte in enumerate(data):
+        while byte:
+            low = byte & -byte
+            ids.append(byte_index * 8 + low.bit_length() - 1)
+            byte ^= low
+    return ids
+
+
+# Values found in more than 1/DENSE_FRACTION of the documents are kept as
+# a bitmap (doc_count/8 bytes); rarer ones as a sorted array of ids (4 bytes
+# each), so the many values of agency/NAICS/week facets stay small
+DENSE_FRACTION = 32
+
+
+def _pack(ids: Union[int, array], doc_count: int) -> Union[int, array]:
+    """Store a value's documents in whichever form suits its density"""
+    if isinstance(ids, int):
+        return ids if ids.bit_count() * DENSE_FRACTION > doc_count else array("I", ids_from_bitmap(ids))
+    return bitmap_from_ids(ids) if len(ids) * DENSE_FRACTION > doc_count else ids
+
+
+def as_bitmap(posting: Union[int, array]) -> int:
+    """A facet value's documents as a bitmap"""
+    return posting if isinstance(posting, int) else bitmap_from_ids(posting)
+
+
+def posting_ids(posting: Union[int, array]):
+    """A facet value's doc ids, ascending"""
+    return ids_from_bitmap(posting) if isinstance(posting, int) else posting
+
+
+def posting_count(posting: Union[int, array]) -> int:
+    return posting.bit_count() if isinstance(posting, int) else len(posting)
+
+
+class FacetIndex:
+    """
+    For every facet value, the set of documents that have it: a bitmap for
+    common values, a sorted id array for rare ones (see DENSE_FRACTION).
+    Python ints serve as bitmaps: & and | run in C over machine words and
+    int.bit_count() gives the count, so combining any number of filters
+    never revisits the records.
+
+    Postings are never modified in place (extending one builds a new int
+    or array), so copy() is cheap and extending the copy leaves the
+    original untouched (same copy-on-write contract as InvertedIndex.copy).
+    """
+
+    def __init__(self, facets: Optional[Dict] = None):
+        self.facets = facets or FACETS
+        # facet -> value -> bitmap (int) or sorted array('I') of doc ids
+        self.postings = {name: {} for name in self.facets}
+        self.doc_count = 0
+
+    def copy(self) -> "FacetIndex":
+        clone = FacetIndex(self.facets)
+        clone.postings = {name: dict(values) for name, values in self.postings.items()}
+        clone.doc_count = self.doc_count
+        return clone
+
+    def add_many(self, records: Iterable[Mapping], start_id: int = 0):
+        """Index records whose ids continue from start_id"""
+        # Collect new ids per value first, then extend each value's postings once
+        new_ids = {name: {} for name in self.facets}
+        added = 0
+        for offset, record in enumerate(records):
+            for name, extract in self.facets.items():
+                value = extract(record)
+                if value:
+                    new_ids[name].setdefault(value, []).append(start_id + offset)
+            added += 1
+        self.doc_count = max(self.doc_count, start_id + added)
+
+        for name, values in new_ids.items():
+            postings = self.postings[name]
+            for value, doc_ids in values.items():
+                old = postings.get(value)
+                if old is None:
+                    merged = array("I", doc_ids)
+                elif isinstance(old, int):
+                    merged = old | bitmap_from_ids(doc_ids)
+                else:
+                    merged = old + array("I", doc_ids)
+                postings[value] = _pack(merged, self.doc_count)
+
+    def _all(self) -> int:
+        return (1 << self.doc_count) - 1
+
+    def match(self, filters: Dict[str, List[str]], exclude: Optional[str] = None,
+              base: Optional[int] = None) -> int:
+        """
+        Bitmap of documents matching all filters: values of one facet are
+        ORed, different facets are ANDed.
+
+        Args:
+            filters: facet -> accepted values
+            exclude: Ignore this facet's filter (for its own counts)
+            base: Starting set, e.g. a text search's matches (default: all)
+        """
+        result = self._all() if base is None else base
+        for name, values in filters.items():
+            if name == exclude or not values:
+                continue
+            selected = 0
+            for value in values:
+                posting = self.postings.get(name, {}).get(value)
+                if posting is not None:
+                    selected |= as_bitmap(posting)
+            result &= selected
+            if not result:
+                break
+        return result
+
+    def counts(self, filters: Optional[Dict[str, List[str]]] = None, base: Optional[int] = None,
+               limit: Optional[int] = None) -> Dict:
+        """
+        Facet counts for a filter combination.
+
+        Each facet is counted with every filter except its own applied, so
+        the response also shows how many results the other values of an
+        already-filtered facet would give.
+
+        Returns:
+            {'total': matching documents,
+             'facets': {facet: [{'value': v, 'count': n}, ...] by count desc}}
+        """
+        filters = {name: values for name, values in (filters or {}).items() if name in self.facets}
+        facets = {}
+        for name in self.facets:
+            scoped = base is not None or any(other != name for other in filters)
+            scope = self.match(filters, exclude=name, base=base)
+            # Sparse values are counted by looking their ids up in the scope
+            scope_bytes = scope.to_bytes((max(self.doc_count, scope.bit_length()) + 7) // 8, "little") if scoped else b""
+            counted = []
+            for value, posting in self.postings[name].items():
+                if not scoped:
+                    count = posting_count(posting)
+                elif isinstance(posting, int):
+                    count = (posting & scope).bit_count()
+                else:
+                    count = sum(scope_bytes[doc_id >> 3] >> (doc_id & 7) & 1 for doc_id in posting)
+                if count:
+                    counted.append({"value": value, "count": count})
+            counted.sort(key=lambda c: (-c["count"], c["value"]))
+            facets[name] = counted[:limit] if limit else counted
+
+        return {
+            "total": self.match(filters, base=base).bit_count(),
+            "facets": facets,
+        }
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+"""
+SQLite FTS5 search over the opportunities table
+BM25-ranked matches with snippet highlighting and column filters
+"""
+
+import os
+import re
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+from config import DB_FILE
+from storage import connect
+
+# Columns of opportunities_fts, in table order (see migrations._fts_index)
+FTS_COLUMNS = ["title", "description", "naics", "agency", "solicitationNumber"]
+
+# bm25() weights per FTS column: title and classification fields outrank body text
+BM25_WEIGHTS = [3.0, 1.0, 2.0, 2.0, 1.0]
+
+TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def fts_available(db_file=None) -> bool:
+    """True if the database has the FTS5 index"""
+    if not os.path.exists(db_file or DB_FILE):
+        return False
+    try:
+        conn = connect(db_file)
+        row = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'opportunities_fts'"
+        ).fetchone()
+        conn.close()
+        return row is not None
+    except sqlite3.Error:
+        return False
+
+
+def build_match(query: str, columns: Optional[List[str]] = None, prefix_last: bool = False) -> str:
+    """
+    Translate a user query into an FTS5 MATCH expression.
+
+    Same syntax as the in-memory index: terms are ANDed, 'OR' separates
+    clauses and 'term*' is a prefix match. Every term is quoted, so FTS5
+    operators typed by the user are treated as plain words.
+    """
+    clauses = []
+    for clause in re.split(r"\s+OR\s+", query.strip()):
+        raw_terms = clause.split()
+        terms = []
+        for idx, raw in enumerate(raw_terms):
+            prefix = raw.endswith("*") or (prefix_last and idx == len(raw_terms) - 1)
+            for token in TERM_RE.findall(raw):
+                terms.append(f'"{token}"' + ("*" if prefix else ""))
+        if terms:
+            clauses.append("(" + " AND ".join(terms) + ")")
+
+    if not clauses:
+        return ""
+
+    expression = " OR ".join(clauses)
+    if columns:
+        expression = "{" + " ".join(c for c in columns if c in FTS_COLUMNS) + "} : (" + expression + ")"
+    return expression
+
+
+def search_fts(query: str, columns: Optional[List[str]] = None, limit: int = 10, offset: int = 0,
+               prefix_last: bool = False, after: Optional[Tuple[float, int]] = None,
+               db_file=None) -> Tuple[List[Dict], int]:
+    """
+    Search the FTS5 index.
+
+    Args:
+        query: User query (see build_match)
+        columns: Restrict matching to these FTS columns (default: all)
+        limit, offset: Page of results to return, best match first
+        after: (rank, id) of the last row of the previous page; keyset
+            alternative to offset that doesn't walk the skipped rows
+        prefix_last: Prefix-match the last term of each clause
+        db_file: Database path (default: config.DB_FILE)
+
+    Returns:
+        (rows, total) where rows are dicts of opportunity columns plus
+        'snippet' (with <mark> highlighting) and 'rank' (lower is better)
+    """
+    match = build_match(query, columns, prefix_last)
+    if not match:
+        return [], 0
+
+    # Highlight the description unless the filter excludes it
+    snippet_column = FTS_COLUMNS.index("description")
+    if columns and "description" not in columns:
+        snippet_column = FTS_COLUMNS.index(columns[0])
+
+    bm25 = f"bm25(opportunities_fts, {', '.join(str(w) for w in BM25_WEIGHTS)})"
+    keyset_filter = ""
+    params = [match]
+    if after is not None:
+        keyset_filter = f"AND ({bm25} > ? OR ({bm25} = ? AND o.id > ?))"
+        params += [after[0], after[0], after[1]]
+    params += [limit, offset]
+
+    conn = connect(db_file)
+    conn.row_factory = sqlite3.Row
+    try:
+        total = conn.execute(
+            "SELECT COUNT(*) FROM opportunities_fts WHERE opportunities_fts MATCH ?", (match,)
+        ).fetchone()[0]
+
+        rows = conn.execute(f"""
+            SELECT o.id, o.title, o.solicitationNumber, o.noticeId, o.agency, o.type,
+                   o.postedDate, o.naics, o.opportunityStatus, o.link,
+                   snippet(opportunities_fts, {snippet_column}, '<mark>', '</mark>', '…', 16) AS snippet,
+                   {bm25} AS rank
+            FROM opportunities_fts
+            JOIN opportunities o ON o.id = opportunities_fts.rowid
+            WHERE opportunities_fts MATCH ? {keyset_filter}
+            ORDER BY rank, o.id
+            LIMIT ? OFFSET ?
+        """, params).fetchall()
+    finally:
+        conn.close()
+
+    return [dict(row) for row in rows], total
@@ -0,0 +1,86 @@
+"""
+gunicorn settings for the web dashboard API (gunicorn -c gunicorn.conf.py wsgi:app)
+
+The app - and with it the dataset, search index and facet index - is
+loaded once in the master (preload_app) and inherited by every forked
+worker, so the memory is shared copy-on-write rather than held once per
+worker. Data reloads happen in the master too: on kill -HUP, POST
+/api/reload from any worker, or a change to data/ (checked on a SIGALRM
+timer, not a thread: a thread in the forking master could hold a lock at
+fork time and leave it locked in every worker) it refreshes its dataset
+and gracefully replaces the workers, which fork from the updated master.
+In-flight requests and background jobs finish on the old workers.
+"""
+
+import gc
+import os
+import signal
+
+from config import API_HOST, API_PORT, API_THREADS, API_WORKERS, JOB_DRAIN_SECONDS
+
+bind = f"{API_HOST}:{API_PORT}"
+workers = int(os.environ.get("API_WORKERS", API_WORKERS))
+threads = int(os.environ.get("API_THREADS", API_THREADS))
+worker_class = "gthread"
+preload_app = True
+# Old workers get this long to finish their requests and background jobs
+# on reload/shutdown (see worker_exit); new workers serve in the meantime
+graceful_timeout = JOB_DRAIN_SECONDS + 30
+timeout = 120
+
+# Data file signature at the last reload (see when_ready)
+_seen = {}
+
+
+def when_ready(server):
+    import api_server
+
+    dataset = api_server.LOADER.dataset
+    server.log.info(f"Loaded {len(dataset.records)} opportunities (data version {dataset.version})")
+
+    loader = api_server.LOADER
+    if loader.interval <= 0:
+        return
+    _seen["signature"] = loader.file_signature()
+
+    def check_data(signum, frame):
+        # Runs on the master's main thread between its own steps: only stat
+        # the files here and leave the reload to the SIGHUP handling
+        signature = loader.file_signature()
+        if signature != _seen["signature"]:
+            _seen["signature"] = signature
+            os.kill(os.getpid(), signal.SIGHUP)
+
+    signal.signal(signal.SIGALRM, check_data)
+    # Timers aren't inherited across fork, so this only fires in the master
+    signal.setitimer(signal.ITIMER_REAL, loader.interval, loader.interval)
+
+
+def on_reload(server):
+    """SIGHUP: refresh the master's data before the new workers are forked"""
+    import api_server
+
+    _seen["signature"] = api_server.LOADER.file_signature()
+    if api_server.LOADER.refresh():
+        server.log.info(f"Reloaded data (version {api_server.LOADER.dataset.version})")
+
+
+def pre_fork(server, worker):
+    # Move the loaded objects out of the collector's generations, so GC passes
+    # in the workers don't write to (and un-share) their memory pages
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    import api_server
+
+    api_server.MASTER_PID = server.pid
+
+
+def worker_exit(server, worker):
+    """Let document downloads and analyses running in this worker finish (see jobs.py)"""
+    import api_server
+
+    unfinished = api_server.JOBS.drain(timeout=JOB_DRAIN_SECONDS)
+    if unfinished:
+        server.log.warning(f"Worker {worker.pid} exiting with {unfinished} unfinished background job(s)")
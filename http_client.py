@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""
+Shared HTTP transport for SAM.gov calls
+One pooled, keep-alive requests.Session reused by every module
+"""
+
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_POOL_BLOCK, MAX_RETRIES
+from throttle import get_throttler, backoff_delay
+
+USER_AGENT = "SAM-Client/1.0"
+
+# Hosts whose requests count against the API key quota
+THROTTLED_HOSTS = ("api.sam.gov",)
+
+# Statuses worth retrying; anything else is returned to the caller as-is
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def create_session(pool_connections=HTTP_POOL_CONNECTIONS,
+                   pool_maxsize=HTTP_POOL_MAXSIZE,
+                   pool_block=HTTP_POOL_BLOCK,
+                   user_agent=USER_AGENT) -> requests.Session:
+    """
+    Build a pooled session
+
+    Args:
+        pool_connections: Number of hosts to keep connection pools for
+        pool_maxsize: Maximum open connections kept per host
+        pool_block: Block when a host's pool is exhausted instead of
+            opening extra throwaway connections (caps per-host load)
+        user_agent: User-Agent header sent with every request
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections,
+                          pool_maxsize=pool_maxsize,
+                          pool_block=pool_block)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        'User-Agent': user_agent,
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive'
+    })
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide shared session, creating it on first use"""
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+
+    return _session
+
+
+def get(url, params=None, retries=MAX_RETRIES, **kwargs) -> requests.Response:
+    """
+    GET through the shared session with throttling and retries.
+
+    SAM.gov requests wait on the shared throttler first. Timeouts,
+    connection errors and retryable statuses are retried with jittered
+    exponential backoff (or the server's Retry-After on a 429). The final
+    response is returned even if it is an error; the final exception is
+    re-raised if every attempt failed to connect.
+    """
+    throttled = urlparse(url).hostname in THROTTLED_HOSTS
+    throttler = get_throttler()
+
+    for attempt in range(retries + 1):
+        if throttled:
+            throttler.wait()
+
+        try:
+            response = get_session().get(url, params=params, **kwargs)
+        except (requests.Timeout, requests.ConnectionError) as e:
+            if attempt == retries:
+                raise
+            delay = backoff_delay(attempt)
+            print(f"[{datetime.now()}] {type(e).__name__}, retrying in {delay:.1f}s "
+                  f"(attempt {attempt + 1}/{retries})")
+            time.sleep(delay)
+            continue
+
+        retry_after = throttler.observe(response.status_code, response.headers) if throttled else None
+
+        if response.status_code not in RETRY_STATUSES or attempt == retries:
+            return response
+
+        delay = retry_after if retry_after is not None else backoff_delay(attempt)
+        print(f"[{datetime.now()}] HTTP {response.status_code}, retrying in {delay:.1f}s "
+              f"(attempt {attempt + 1}/{retries})")
+        response.close()
+        # A 429 already paused the shared throttler for everyone
+        if retry_after is None:
+            time.sleep(delay)
+
+    return response
+
+
+def close_session():
+    """Close the shared session and drop its pooled connections"""
+    global _session
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+"""
+In-process background job queue for slow API work
+(SAM.gov document downloads, bidding analysis)
+
+Jobs run on a thread pool; their status, progress and result are written
+through to the jobs table, so any server process (e.g. another gunicorn
+worker) can answer a status poll. Each row records the pid of the process
+running it; unfinished jobs of a process that has exited (a worker
+recycled by a reload) are marked failed, so pollers don't wait forever.
+"""
+
+import json
+import os
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from config import JOB_RETENTION_SECONDS, JOB_WORKERS
+from migrations import ensure_jobs_table
+from storage import connect
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+
+
+def _alive(pid: Optional[int]) -> bool:
+    if pid is None:
+        return False
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":
+        # os.kill would terminate it; Windows serves from one process
+        # (waitress), so another pid is a previous, exited server
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class Job:
+    """State of one background job; the function it runs reports progress through it"""
+
+    def __init__(self, kind: str, job_id: Optional[str] = None):
+        self.id = job_id or uuid.uuid4().hex
+        self.kind = kind
+        self.status = QUEUED
+        self.progress = {"done": 0, "total": 0, "message": "Queued"}
+        self.result = None
+        self.error = None
+        self.created_at = datetime.now().isoformat()
+        self.started_at = None
+        self.finished_at = None
+        self._queue = None
+        self._done = threading.Event()
+
+    def update(self, done: Optional[int] = None, total: Optional[int] = None, message: Optional[str] = None):
+        """Record progress, e.g. job.update(done=2, total=5, message="Downloading attachments")"""
+        if done is not None:
+            self.progress["done"] = done
+        if total is not None:
+            self.progress["total"] = total
+        if message is not None:
+            self.progress["message"] = message
+        if self._queue is not None:
+            self._queue._save(self)
+
+    def to_dict(self) -> Dict:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": dict(self.progress),
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobQueue:
+    """
+    Thread pool plus job registry.
+
+    submit(kind, fn, *args) returns a Job immediately; fn(job, *args) runs on
+    a pool thread. Its return value becomes job.result. A dict result with
+    success=False, or an exception, marks the job failed. Finished jobs are
+    kept for JOB_RETENTION_SECONDS.
+    """
+
+    def __init__(self, max_workers: int = JOB_WORKERS, retention_seconds: int = JOB_RETENTION_SECONDS,
+                 db_file=None):
+        self.max_workers = max_workers
+        self.retention = timedelta(seconds=retention_seconds)
+        self.db_file = db_file
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._schema_ready = False
+
+    def _connect(self):
+        conn = connect(self.db_file)
+        if not self._schema_ready:
+            # Only the jobs table; the rest of the schema is migrated by
+            # init_db. IMMEDIATE serializes workers checking for its columns
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                ensure_jobs_table(conn)
+            self._schema_ready = True
+            self._fail_orphans(conn)
+        return conn
+
+    def _fail_orphans(self, conn):
+        """Mark unfinished jobs whose process has exited as failed"""
+        now = datetime.now().isoformat()
+        orphans = [job_id for job_id, owner in conn.execute(
+            "SELECT id, owner FROM jobs WHERE finished_at IS NULL") if not _alive(owner)]
+        if not orphans:
+            return
+        progress = json.dumps({"done": 0, "total": 0, "message": "Failed"})
+        with conn:
+            conn.executemany(
+                "UPDATE jobs SET status = ?, progress = ?, error = ?, finished_at = ? "
+                "WHERE id = ? AND finished_at IS NULL",
+                [(FAILED, progress, "The server process running this job exited before it finished", now, job_id)
+                 for job_id in orphans])
+        print(f"⚠ Marked {len(orphans)} interrupted background job(s) as failed")
+
+    def _save(self, job: Job):
+        data = job.to_dict()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("""
+                    INSERT INTO jobs (id, kind, status, progress, result, error,
+                                      created_at, started_at, finished_at, owner)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        status = excluded.status, progress = excluded.progress,
+                        result = excluded.result, error = excluded.error,
+                        started_at = excluded.started_at, finished_at = excluded.finished_at
+                """, (job.id, job.kind, job.status, json.dumps(data["progress"]),
+                      json.dumps(job.result) if job.result is not None else None,
+                      job.error, job.created_at, job.started_at, job.finished_at, os.getpid()))
+        finally:
+            conn.close()
+
+    def _load(self, job_id: str) -> Optional[Dict]:
+        query = ("SELECT id, kind, status, progress, result, error, created_at, started_at, finished_at, owner "
+                 "FROM jobs WHERE id = ?")
+        conn = self._connect()
+        try:
+            row = conn.execute(query, (job_id,)).fetchone()
+            if row is not None and row[8] is None and not _alive(row[9]):
+                # Run by a worker that has since exited
+                self._fail_orphans(conn)
+                row = conn.execute(query, (job_id,)).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return {
+            "job_id": row[0], "kind": row[1], "status": row[2],
+            "progress": json.loads(row[3]) if row[3] else {},
+            "result": json.loads(row[4]) if row[4] else None,
+            "error": row[5], "created_at": row[6], "started_at": row[7], "finished_at": row[8],
+        }
+
+    def submit(self, kind: str, fn: Callable, *args) -> Job:
+        """Queue fn(job, *args) and return its Job"""
+        self.purge()
+        job = Job(kind)
+        job._queue = self
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+            self._jobs[job.id] = job
+        self._save(job)
+        self._executor.submit(self._run, job, fn, args)
+        return job
+
+    def _run(self, job: Job, fn: Callable, args):
+        job.status = RUNNING
+        job.started_at = datetime.now().isoformat()
+        job.update(message="Running")
+        try:
+            job.result = fn(job, *args)
+            failed = isinstance(job.result, dict) and job.result.get("success") is False
+            job.status = FAILED if failed else SUCCEEDED
+            if failed:
+                job.error = job.result.get("error") or job.result.get("message")
+        except Exception as e:
+            print(f"[ERROR] Job {job.id} ({job.kind}) failed: {e}")
+            job.status = FAILED
+            job.error = str(e)
+            job.result = {"success": False, "error": str(e), "debug": traceback.format_exc()}
+        job.finished_at = datetime.now().isoformat()
+        job.update(message="Done" if job.status == SUCCEEDED else "Failed")
+        job._done.set()
+
+    def drain(self, timeout: Optional[float] = None) -> int:
+        """
+        Wait up to timeout seconds (forever if None) for this process's
+        queued and running jobs to finish, e.g. before it exits.
+        Returns the number of jobs still unfinished.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._lock:
+            pending = [job for job in self._jobs.values() if job.finished_at is None]
+        for job in pending:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            job._done.wait(remaining)
+        return sum(1 for job in pending if not job._done.is_set())
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Job status as a dict, from this process or the jobs table; None if unknown or expired"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        return self._load(job_id)
+
+    def list(self, limit: int = 50) -> List[Dict]:
+        """Most recent jobs of every process, newest first"""
+        conn = self._connect()
+        try:
+            ids = [row[0] for row in conn.execute(
+                "SELECT id FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,))]
+        finally:
+            conn.close()
+        return [job for job in (self.get(job_id) for job_id in ids) if job]
+
+    def purge(self):
+        """Forget jobs that finished longer ago than the retention period"""
+        cutoff = (datetime.now() - self.retention).isoformat()
+        with self._lock:
+            for job_id in [j.id for j in self._jobs.values() if j.finished_at and j.finished_at < cutoff]:
+                del self._jobs[job_id]
+        conn = self._connect()
+        try:
+            self._fail_orphans(conn)
+            with conn:
+                conn.execute("DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (cutoff,))
+        finally:
+            conn.close()
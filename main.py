@@ -3,10 +3,13 @@
 Main script that streams SAM.gov API results and saves them incrementally.
 Uses generator pattern to process batches as they arrive.
 """
+import asyncio
+import sys
 from pathlib import Path
 
 from sam_api import search_sam
-from storage import save_csv_extended, init_db, save_db
+from storage import save_csv_extended, init_db, save_db, CSVSink
+from config import SNAPSHOT_FORMAT
 from datetime import datetime
 
 # Mock data - simulates SAM.gov API responses for IT opportunities (for fallback)
@@ -97,23 +100,91 @@ def save_sam_data():
     search_generator = search_sam(
         keyword="IT",
         naics=["541511", "541512", "541513", "541519"],
-        agencies=None
+        agencies=None,
+        concurrent=True
     )
 
+    sinks = open_snapshot_sinks(data_path)
+    try:
+        for batch in search_generator:
+            batch_num += 1
+            batch_count = len(batch)
+            total_count += batch_count
+
+            print(f"[{datetime.now()}] Processing batch {batch_num} ({batch_count} records)...")
+            print(f"[{datetime.now()}]   → Appending to snapshot files...")
+
+            for sink in sinks:
+                sink.write_batch(batch)
+            print(f"[{datetime.now()}]   ✅ Batch {batch_num} saved (Total so far: {total_count})")
+            print()
+    finally:
+        for sink in sinks:
+            sink.close()
+    return total_count
 
-    for batch in search_generator:
-        batch_num += 1
-        batch_count = len(batch)
-        total_count += batch_count
 
-        print(f"[{datetime.now()}] Processing batch {batch_num} ({batch_count} records)...")
+def open_snapshot_sinks(data_path):
+    """
+    Open the snapshot writers selected by config.SNAPSHOT_FORMAT: one
+    rolling CSV with a fixed header and/or a memory-mappable Arrow file
+    """
+    sinks = []
+    if SNAPSHOT_FORMAT in ("csv", "both"):
+        sinks.append(CSVSink(data_path, prefix="sam_results_extended", rotate_daily=True))
+    if SNAPSHOT_FORMAT in ("arrow", "both"):
+        from columnar import ArrowSink
+        # With "both" the CSV parts hold the same rows, and loaders read those
+        sinks.append(ArrowSink(data_path, prefix="sam_results_extended", mirrors_csv=SNAPSHOT_FORMAT == "both"))
+    return sinks
 
-        # Update CSV file with all records so far
-        print(f"[{datetime.now()}]   → Updating CSV file...")
 
-        save_csv_extended(results=batch, filename=data_path.joinpath(f"sam_results_extended_{batch_num}.csv"))
-        print(f"[{datetime.now()}]   ✅ Batch {batch_num} saved (Total so far: {total_count})")
-        print()
+def sync_sam_data():
+    """Incrementally sync the IT query into the database (see sync.py)"""
+    from sync import sync_all
+
+    return sync_all([{
+        "keyword": "IT",
+        "naics": ["541511", "541512", "541513", "541519"],
+        "notice_type": "Solicitation"
+    }])
+
+
+def save_sam_data_async():
+    """Run one search per IT NAICS code concurrently on a single event loop"""
+    from sam_async import AsyncSAMClient
+
+    data_path = Path(r"C:\Users\gagan\source\repos\sam_project\data")
+    naics_codes = ["541511", "541512", "541513", "541519"]
+    queries = [{"keyword": "IT", "naics": [code]} for code in naics_codes]
+
+    async def run_queries():
+        async with AsyncSAMClient() as client:
+            return await client.run_queries(queries)
+
+    results = asyncio.run(run_queries())
+
+    # The same notice can match several NAICS queries
+    seen = set()
+    total_count = 0
+    sinks = open_snapshot_sinks(data_path)
+    try:
+        for idx, records in results.items():
+            unique = []
+            for r in records:
+                key = r.get("noticeId") or id(r)
+                if key not in seen:
+                    seen.add(key)
+                    unique.append(r)
+
+            print(f"[{datetime.now()}] NAICS {naics_codes[idx]}: {len(records)} records ({len(unique)} new)")
+            for sink in sinks:
+                sink.write_batch(unique)
+            total_count += len(unique)
+    finally:
+        for sink in sinks:
+            sink.close()
+
     return total_count
 
 
@@ -129,7 +200,13 @@ if __name__ == "__main__":
         print(f"[{datetime.now()}] ✅ Database initialized")
         print()
 
-        total = save_sam_data()
+        if "--sync" in sys.argv:
+            # Incremental: only notices newer than the stored high-water mark
+            total = sync_sam_data()
+        elif "--async" in sys.argv:
+            total = save_sam_data_async()
+        else:
+            total = save_sam_data()
 
         # Search SAM.gov API and process results as they stream in
         print(f"[{datetime.now()}] Starting SAM.gov search for IT opportunities...")
@@ -145,7 +222,7 @@ if __name__ == "__main__":
         print(f"[{datetime.now()}] Total records processed: {total}")
         print(f"[{datetime.now()}] Files created:")
         print(f"[{datetime.now()}]   - Database: sam_opportunities.db")
-        print(f"[{datetime.now()}]   - CSV: sam_results_extended.csv")
+        print(f"[{datetime.now()}]   - CSV: data/sam_results_extended_<date>.csv")
         
     except Exception as e:
         print(f"[{datetime.now()}] ❌ ERROR: {str(e)}")
@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+"""
+Forward-only schema migrations for sam_opportunities.db
+Each migration runs once, in order, and is recorded in schema_version
+"""
+
+import sqlite3
+from datetime import datetime
+
+
+def _columns(c, table):
+    return {row[1] for row in c.execute(f"PRAGMA table_info({table})")}
+
+
+def _create_opportunities(c):
+    """Base opportunities table (the original init_db schema)"""
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS opportunities (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT,
+            solicitationNumber TEXT,
+            noticeId TEXT,
+            agency TEXT,
+            type TEXT,
+            notice_type TEXT,
+            postedDate TEXT,
+            naics TEXT,
+            description TEXT,
+            opportunityStatus TEXT,
+            classificationCode TEXT,
+            pointOfContact TEXT,
+            link TEXT
+        )
+    """)
+
+
+def _unique_notice_id(c):
+    """Unique noticeId index used by the save_db upsert"""
+    # Rows without a noticeId are all kept (NULLs don't collide in a
+    # unique index), so turn '' into NULL before deduplicating
+    c.execute("UPDATE opportunities SET noticeId = NULL WHERE noticeId = ''")
+    # Keep the newest row per noticeId so the index can be built over
+    # tables written before upserts existed
+    c.execute("""
+        DELETE FROM opportunities
+        WHERE noticeId IS NOT NULL AND id NOT IN (
+            SELECT MAX(id) FROM opportunities
+            WHERE noticeId IS NOT NULL GROUP BY noticeId
+        )
+    """)
+    c.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_opportunities_noticeId ON opportunities(noticeId)")
+
+
+def _posted_date_iso(c):
+    """Normalized postedDateISO column, backfilled from postedDate"""
+    if "postedDateISO" not in _columns(c, "opportunities"):
+        c.execute("ALTER TABLE opportunities ADD COLUMN postedDateISO TEXT")
+    # normalize_posted_date is registered by storage.connect()
+    c.execute("UPDATE opportunities SET postedDateISO = normalize_posted_date(postedDate) "
+              "WHERE postedDateISO IS NULL")
+
+
+def _secondary_indexes(c):
+    """Indexes for the checker's and dashboards' sorted/filtered reads"""
+    for name, column in [
+        ("idx_opportunities_solicitationNumber", "solicitationNumber"),
+        ("idx_opportunities_naics", "naics"),
+        ("idx_opportunities_agency", "agency"),
+        ("idx_opportunities_postedDateISO", "postedDateISO"),
+    ]:
+        c.execute(f"CREATE INDEX IF NOT EXISTS {name} ON opportunities({column})")
+
+
+def _sync_state(c):
+    """High-water marks for incremental sync (see sync.py)"""
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS sync_state (
+            query_key TEXT PRIMARY KEY,
+            high_water TEXT,
+            last_run TEXT,
+            records INTEGER
+        )
+    """)
+
+
+def _fts_index(c):
+    """FTS5 full-text index kept in sync with opportunities by triggers"""
+    columns = "title, description, naics, agency, solicitationNumber"
+    new_values = "new.title, new.description, new.naics, new.agency, new.solicitationNumber"
+    old_values = "old.title, old.description, old.naics, old.agency, old.solicitationNumber"
+    try:
+        c.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS opportunities_fts USING fts5(
+                {columns},
+                content='opportunities', content_rowid='id',
+                tokenize='unicode61'
+            )
+        """)
+    except sqlite3.OperationalError as e:
+        # SQLite builds without FTS5: full-text search stays unavailable
+        print(f"  ⚠ FTS5 not available, skipping full-text index: {e}")
+        return
+
+    c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS opportunities_fts_ai AFTER INSERT ON opportunities BEGIN
+            INSERT INTO opportunities_fts(rowid, {columns}) VALUES (new.id, {new_values});
+        END
+    """)
+    c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS opportunities_fts_ad AFTER DELETE ON opportunities BEGIN
+            INSERT INTO opportunities_fts(opportunities_fts, rowid, {columns})
+            VALUES ('delete', old.id, {old_values});
+        END
+    """)
+    c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS opportunities_fts_au AFTER UPDATE ON opportunities BEGIN
+            INSERT INTO opportunities_fts(opportunities_fts, rowid, {columns})
+            VALUES ('delete', old.id, {old_values});
+            INSERT INTO opportunities_fts(rowid, {columns}) VALUES (new.id, {new_values});
+        END
+    """)
+    c.execute("INSERT INTO opportunities_fts(opportunities_fts) VALUES ('rebuild')")
+
+
+def create_jobs_table(c):
+    """Background job status shared by all API server processes (see jobs.py)"""
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT,
+            status TEXT,
+            progress TEXT,
+            result TEXT,
+            error TEXT,
+            created_at TEXT,
+            started_at TEXT,
+            finished_at TEXT
+        )
+    """)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at)")
+
+
+def _classification_columns(c):
+    """Persisted RFI/RFQ/RFP classification (filled by storage.reclassify_stale)"""
+    existing = _columns(c, "opportunities")
+    for column, sql_type in [("document_type", "TEXT"), ("keyword_match", "TEXT"),
+                             ("classifier_version", "INTEGER")]:
+        if column not in existing:
+            c.execute(f"ALTER TABLE opportunities ADD COLUMN {column} {sql_type}")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_opportunities_document_type ON opportunities(document_type)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_opportunities_classifier_version "
+              "ON opportunities(classifier_version)")
+
+    _fts_update_trigger(c)
+
+
+def _fts_update_trigger(c):
+    """
+    Writing the classification columns mustn't churn the full-text index:
+    re-index only when an indexed column is updated
+    """
+    columns = "title, description, naics, agency, solicitationNumber"
+    if c.execute("SELECT 1 FROM sqlite_master WHERE name = 'opportunities_fts_au'").fetchone():
+        c.execute("DROP TRIGGER opportunities_fts_au")
+        c.execute(f"""
+            CREATE TRIGGER opportunities_fts_au AFTER UPDATE OF {columns} ON opportunities BEGIN
+                INSERT INTO opportunities_fts(opportunities_fts, rowid, {columns})
+                VALUES ('delete', old.id, old.title, old.description, old.naics, old.agency, old.solicitationNumber);
+                INSERT INTO opportunities_fts(rowid, {columns})
+                VALUES (new.id, new.title, new.description, new.naics, new.agency, new.solicitationNumber);
+            END
+        """)
+
+
+def _job_owner(c):
+    """Process running each job, so jobs of exited workers can be failed (see jobs.py)"""
+    if "owner" not in _columns(c, "jobs"):
+        c.execute("ALTER TABLE jobs ADD COLUMN owner INTEGER")
+
+
+def ensure_jobs_table(c):
+    """The jobs table in its latest form, for JobQueue's own connections"""
+    create_jobs_table(c)
+    _job_owner(c)
+
+
+# (version, migration) pairs. Append new migrations; never edit or reorder
+# ones that have shipped. Each must be safe to run over a database that
+# predates schema_version, where the objects it creates may already exist.
+MIGRATIONS = [
+    (1, _create_opportunities),
+    (2, _unique_notice_id),
+    (3, _posted_date_iso),
+    (4, _secondary_indexes),
+    (5, _sync_state),
+    (6, _fts_index),
+    (7, create_jobs_table),
+    (8, _classification_columns),
+    (9, _job_owner),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(conn) -> int:
+    """Return the schema version recorded in the database (0 if none)"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            applied_at TEXT
+        )
+    """)
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def _has_fts_index(conn) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'opportunities_fts'").fetchone() is not None
+
+
+def _ensure_fts_index(conn, version):
+    """
+    Migration 6 is recorded even when SQLite lacked FTS5 at the time; build
+    the index (with the triggers of later migrations) once FTS5 is there
+    """
+    if _has_fts_index(conn):
+        return
+    with conn:
+        c = conn.cursor()
+        c.execute("BEGIN")
+        _fts_index(c)
+        if version >= 8 and _has_fts_index(conn):
+            _fts_update_trigger(c)
+    if _has_fts_index(conn):
+        print("  ✓ Built the FTS5 full-text index skipped by schema migration 6")
+
+
+def migrate(conn) -> int:
+    """
+    Apply pending migrations in order, each in its own transaction.
+    Returns the number of migrations applied (0 when already up to date).
+    """
+    version = current_version(conn)
+    if version >= 6:
+        _ensure_fts_index(conn, version)
+    if version >= LATEST_VERSION:
+        return 0
+
+    applied = 0
+    for target, migration in MIGRATIONS:
+        if target <= version:
+            continue
+        with conn:
+            c = conn.cursor()
+            # Explicit BEGIN so DDL is part of the transaction too
+            c.execute("BEGIN")
+            migration(c)
+            c.execute("INSERT INTO schema_version (version, applied_at) VALUES (?, ?)",
+                      (target, datetime.now().isoformat()))
+        print(f"  ✓ Applied schema migration {target}: {migration.__doc__}")
+        applied += 1
+
+    return applied
@@ -1,6 +1,8 @@
 import requests
 import json
 
+import http_client
+
 # Common IT-related NAICS codes and a comprehensive list
 NAICS_CODES_DB = {
     # Computer & IT Services
@@ -82,7 +84,7 @@ def _fetch_from_sam_api(api_key):
                 "offset": offset,
             }
             
-            response = requests.get(
+            response = http_client.get(
                 "https://api.sam.gov/opportunities/v2/search",
                 params=params,
                 timeout=10
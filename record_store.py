@@ -0,0 +1,270 @@
+#!/usr/bin/env python
+"""
+Compact column-oriented storage for loaded opportunity records
+Interned low-cardinality columns, compressed large text, dict-like row views
+"""
+
+import threading
+import zlib
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping, Sequence
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Columns with few distinct values: stored as small integer codes into a
+# shared value pool instead of one string object per row
+LOW_CARDINALITY_COLUMNS = {
+    "type", "baseType", "archiveType", "active", "typeOfSetAside",
+    "typeOfSetAsideDescription", "naicsCode", "naicsCodes", "naics",
+    "classificationCode", "organizationType", "fullParentPathName",
+    "fullParentPathCode", "agency", "notice_type", "opportunityStatus",
+}
+
+# Long free text and JSON blobs: kept zlib-compressed and only decoded
+# when a row view reads them
+LARGE_TEXT_COLUMNS = {
+    "description", "pointOfContact", "officeAddress", "placeOfPerformance",
+    "award", "links", "resourceLinks",
+}
+
+# Shorter values of large text columns aren't worth compressing
+COMPRESS_MIN_LENGTH = 128
+
+_ABSENT = 0
+
+
+class ValuePool:
+    """
+    Append-only table of distinct values, shared by the stores of one
+    dataset. Code 0 means the row has no value for the column. Values of
+    stores that are dropped stay in the pool, so long-running loaders
+    move the surviving stores to a fresh pool now and then (with_pool).
+
+    Hold lock while coding values: columns of from_columns() stores are
+    coded by whichever request thread reads them first.
+    """
+
+    def __init__(self):
+        self.values = [None]
+        self._codes = {}
+        self.lock = threading.Lock()
+
+    def code(self, value) -> int:
+        if value is None:
+            return _ABSENT
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def _pack(value):
+    if isinstance(value, str) and len(value) >= COMPRESS_MIN_LENGTH:
+        return zlib.compress(value.encode("utf-8"), 1)
+    return value
+
+
+def _unpack(value):
+    if isinstance(value, bytes):
+        return zlib.decompress(value).decode("utf-8")
+    return value
+
+
+class RecordView(Mapping):
+    """
+    Read-only dict-like view of one row. Supports get(), [], iteration and
+    dict(view); values are materialized on access. None-valued columns are
+    treated as absent, like a missing key in the original dict.
+    """
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "RecordStore", row: int):
+        self._store = store
+        self._row = row
+
+    def __getitem__(self, column):
+        value = self._store.value(self._row, column)
+        if value is None:
+            raise KeyError(column)
+        return value
+
+    def get(self, column, default=None):
+        value = self._store.value(self._row, column)
+        return default if value is None else value
+
+    def __iter__(self):
+        for column in self._store.columns:
+            if self._store.value(self._row, column, decode=False) is not None:
+                yield column
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __eq__(self, other):
+        if isinstance(other, RecordView) and other._store is self._store:
+            return other._row == self._row
+        return Mapping.__eq__(self, other)
+
+    __hash__ = None
+
+    def to_dict(self) -> Dict:
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"RecordView({self.to_dict()!r})"
+
+
+class RecordStore(Sequence):
+    """
+    Immutable column store for a batch of records.
+
+    Indexing returns RecordView objects, so code written against a list of
+    dicts (len, slicing, iteration, row.get) keeps working.
+
+    A store made with from_columns() reads each column from its source on
+    first access, so columns that nothing looks at are never converted.
+    """
+
+    def __init__(self, records: Iterable[Mapping], pool: Optional[ValuePool] = None):
+        records = list(records)
+        self.pool = pool or ValuePool()
+        self._length = len(records)
+
+        names = {}
+        for record in records:
+            for name in record:
+                names.setdefault(name, None)
+        self.columns = list(names)
+
+        self._data = {}
+        for name in self.columns:
+            self._data[name] = self._encode(name, (record.get(name) for record in records))
+        # Column -> function returning its values, for columns not read yet
+        self._sources: Dict[str, Callable[[], Iterable]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_columns(cls, length: int, sources: Dict[str, Callable[[], Iterable]],
+                     pool: Optional[ValuePool] = None) -> "RecordStore":
+        """
+        Store of length rows whose columns are read on first access:
+        sources maps each column name to a function returning its values
+        (None where a row has no value), e.g. from a memory-mapped Arrow table
+        """
+        store = cls((), pool)
+        store._length = length
+        store.columns = list(sources)
+        store._sources = dict(sources)
+        return store
+
+    def _encode(self, name: str, values: Iterable):
+        if name in LOW_CARDINALITY_COLUMNS:
+            with self.pool.lock:
+                return array("I", (self.pool.code(v) for v in values))
+        if name in LARGE_TEXT_COLUMNS:
+            return [_pack(v) for v in values]
+        return list(values)
+
+    def _column_data(self, column: str):
+        data = self._data.get(column)
+        if data is None and column in self._sources:
+            with self._lock:
+                data = self._data.get(column)
+                if data is None:
+                    data = self._data[column] = self._encode(column, self._sources[column]())
+        return data
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [RecordView(self, row) for row in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("record index out of range")
+        return RecordView(self, index)
+
+    def __iter__(self):
+        for row in range(self._length):
+            yield RecordView(self, row)
+
+    def value(self, row: int, column: str, decode: bool = True):
+        """One cell, or None if the row has no value for the column"""
+        data = self._column_data(column)
+        if data is None:
+            return None
+        if column in LOW_CARDINALITY_COLUMNS:
+            return self.pool.values[data[row]]
+        return _unpack(data[row]) if decode else data[row]
+
+    def column(self, column: str) -> List:
+        """Every value of one column (None where absent), for scans and aggregates"""
+        return [self.value(row, column) for row in range(self._length)]
+
+    def with_pool(self, pool: ValuePool) -> "RecordStore":
+        """Copy coded against another pool; only the interned columns are re-encoded, the rest is shared"""
+        clone = RecordStore((), pool)
+        clone._length = self._length
+        clone.columns = self.columns
+        clone._sources = self._sources
+        with self._lock:
+            clone._data = dict(self._data)
+        old_values = self.pool.values
+        for name, codes in list(clone._data.items()):
+            if name in LOW_CARDINALITY_COLUMNS:
+                recoded = {}
+                with pool.lock:
+                    clone._data[name] = array("I", (
+                        recoded[code] if code in recoded else recoded.setdefault(code, pool.code(old_values[code]))
+                        for code in codes
+                    ))
+        return clone
+
+
+class ChainedRecords(Sequence):
+    """
+    Several RecordStores read as one sequence, e.g. one per data file.
+    Extending returns a new chain that shares the existing stores.
+    """
+
+    def __init__(self, stores: Iterable[RecordStore] = ()):
+        self.stores = [s for s in stores if len(s)]
+        # Position of each store's first row in the chain
+        self.offsets = []
+        total = 0
+        for store in self.stores:
+            self.offsets.append(total)
+            total += len(store)
+        self._length = total
+
+    @property
+    def columns(self) -> List[str]:
+        names = {}
+        for store in self.stores:
+            for name in store.columns:
+                names.setdefault(name, None)
+        return list(names)
+
+    def extended(self, stores: Iterable[RecordStore]) -> "ChainedRecords":
+        return ChainedRecords(self.stores + list(stores))
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("record index out of range")
+        pos = bisect_right(self.offsets, index) - 1
+        return self.stores[pos][index - self.offsets[pos]]
+
+    def __iter__(self):
+        for store in self.stores:
+            yield from store
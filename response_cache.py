@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+"""
+Response cache for the read-only Flask API endpoints
+Keyed by endpoint + query string + data version, with strong ETags,
+304 Not Modified and gzip/brotli compression of the cached body
+"""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from flask import make_response, request
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+from config import RESPONSE_CACHE_SIZE
+
+# Smaller bodies aren't worth the compression overhead
+COMPRESS_MIN_BYTES = 1024
+
+
+class _Entry:
+    """One cached 200 response; compressed variants are built on first use"""
+
+    def __init__(self, body: bytes, mimetype: str):
+        self.body = body
+        self.mimetype = mimetype
+        self.digest = hashlib.sha256(body).hexdigest()[:32]
+        self.variants = {}
+        self.lock = threading.Lock()
+
+    def etag(self, encoding):
+        # Strong ETags identify exact bytes, so each encoding gets its own
+        return self.digest if encoding == "identity" else f"{self.digest}-{encoding}"
+
+    def encoded(self, encoding) -> bytes:
+        if encoding == "identity":
+            return self.body
+        with self.lock:
+            if encoding not in self.variants:
+                if encoding == "br":
+                    self.variants[encoding] = brotli.compress(self.body, quality=5)
+                else:
+                    self.variants[encoding] = gzip.compress(self.body, compresslevel=6)
+            return self.variants[encoding]
+
+
+def _choose_encoding(body: bytes) -> str:
+    if len(body) < COMPRESS_MIN_BYTES:
+        return "identity"
+    accepted = request.accept_encodings
+    if BROTLI_AVAILABLE and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return "identity"
+
+
+class ResponseCache:
+    """
+    LRU of serialized responses for one data version.
+
+    get_version is called on every request; when it changes (a reload
+    swapped in a new dataset) all cached entries are dropped, so stale
+    responses are never served and old bodies don't pin memory.
+    """
+
+    def __init__(self, get_version, max_entries: int = RESPONSE_CACHE_SIZE):
+        self.get_version = get_version
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def _lookup(self, key, version):
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _store(self, key, version, entry):
+        with self._lock:
+            if version != self._version:
+                return
+            self._entries[key] = entry
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def cached(self, bypass=None):
+        """
+        Decorator for GET view functions returning JSON.
+
+        Args:
+            bypass: Optional predicate; when it returns True for the current
+                request the view runs uncached (e.g. results from another store)
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if bypass is not None and bypass():
+                    return view(*args, **kwargs)
+
+                version = self.get_version()
+                key = (request.path, tuple(sorted(request.args.items(multi=True))))
+                entry = self._lookup(key, version)
+
+                if entry is None:
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+                    entry = _Entry(response.get_data(), response.mimetype)
+                    self._store(key, version, entry)
+
+                encoding = _choose_encoding(entry.body)
+                etag = entry.etag(encoding)
+                if request.if_none_match.contains(etag):
+                    response = make_response("", 304)
+                else:
+                    response = make_response(entry.encoded(encoding))
+                    response.mimetype = entry.mimetype
+                    if encoding != "identity":
+                        response.headers["Content-Encoding"] = encoding
+
+                response.set_etag(etag)
+                response.headers["Vary"] = "Accept-Encoding"
+                # Always revalidate: cheap 304s, and never stale after a reload
+                response.headers["Cache-Control"] = "no-cache"
+                return response
+            return wrapper
+        return decorator
@@ -5,120 +5,375 @@ Searches SAM.gov for Request for Information, Request for Quote, and Request for
 """
 
 import sqlite3
-from typing import List, Dict, Tuple
+from collections import Counter
+from itertools import chain, islice
+from pathlib import Path
+from typing import List, Dict, Iterable, Iterator, Optional, Sequence, Tuple, Union
 from datetime import datetime
 
+import classifier
+from analytics import OpportunityFrame
+from classifier import CLASSIFIER_VERSION, DOCUMENT_CLASSIFIER, KeywordClassifier, classify_many, worker_count
+from config import CHECKER_CHUNK_SIZE, CLASSIFY_WORKERS
+from facet_index import week_of
+from storage import connect, normalize_posted_date
+
+# Columns the reports print; description is only read to classify rows
+# without a stored classification
+_REPORT_COLUMNS = ["id", "noticeId", "title", "solicitationNumber", "agency", "type",
+                   "postedDate", "naics", "opportunityStatus", "link"]
+
+
+class OpportunityStream:
+    """
+    Re-iterable, lazily read query result of a lazy checker: every
+    iteration streams the rows from the database in chunks, and len()
+    is a COUNT(*) query
+    """
+    
+    def __init__(self, checker: "RFIRFQRFPChecker", doc_type: Optional[str] = None):
+        self.checker = checker
+        self.doc_type = doc_type
+    
+    def __iter__(self) -> Iterator[Dict]:
+        return self.checker._stream(self.doc_type)
+    
+    def __len__(self) -> int:
+        return self.checker._count(self.doc_type)
+
 
 class RFIRFQRFPChecker:
-    """Check for RFI, RFQ, and RFP documents in opportunities"""
+    """
+    Check for RFI, RFQ, and RFP documents in opportunities
+    
+    since/until (posted dates), agency (one or a list of exact names) and
+    doc_type filter the opportunities in SQL. By default they are all
+    loaded into self.opportunities; with lazy=True nothing is loaded up
+    front and self.opportunities is an OpportunityStream, so reports over
+    a large database run in bounded memory.
+
+    The checker only reads the database. Rows whose stored classification
+    is missing or from an older CLASSIFIER_VERSION (save_db/init_db keep it
+    current) are classified in memory, as are all rows for a subclass with
+    its own keywords. workers != 1 does that on a process pool
+    (classifier.classify_many), with the same results as in-process.
+    """
     
-    # Keywords to identify document types
-    RFI_KEYWORDS = ["rfi", "request for information", "information request"]
-    RFQ_KEYWORDS = ["rfq", "request for quote", "request for quotation", "quotation"]
-    RFP_KEYWORDS = ["rfp", "request for proposal", "proposal request"]
+    # Keywords to identify document types (shared with the stored
+    # opportunities.document_type column, see classifier.py)
+    RFI_KEYWORDS = classifier.RFI_KEYWORDS
+    RFQ_KEYWORDS = classifier.RFQ_KEYWORDS
+    RFP_KEYWORDS = classifier.RFP_KEYWORDS
     
-    def __init__(self, db_file="sam_opportunities.db"):
+    _compiled = None
+    
+    def __init__(self, db_file="sam_opportunities.db", lazy: bool = False,
+                 since: Optional[str] = None, until: Optional[str] = None,
+                 agency: Union[str, Sequence[str], None] = None, doc_type: Optional[str] = None,
+                 chunk_size: int = CHECKER_CHUNK_SIZE, workers: int = CLASSIFY_WORKERS):
         """Initialize the checker"""
         self.db_file = db_file
+        self.lazy = lazy
+        self.since = normalize_posted_date(since) if since else None
+        self.until = normalize_posted_date(until) if until else None
+        self.agencies = [agency] if isinstance(agency, str) else list(agency or [])
+        self.doc_type = doc_type
+        self.chunk_size = chunk_size
+        self.workers = workers
         self.opportunities = []
+        self._classified = {}  # noticeId (or row id) -> (document_type, keyword)
+        self._by_type = None
+        # Stored classifications are only valid for the shared keyword lists
+        self._use_stored = self.classifier().rules == DOCUMENT_CLASSIFIER.rules
         self.load_opportunities()
     
-    def load_opportunities(self):
-        """Load opportunities from database"""
+    def _label(self, doc_type: str) -> str:
+        """Canonical label ('rfq' -> 'RFQ', 'solicitation' -> 'Solicitation')"""
+        compiled = self.classifier()
+        for label in [label for label, _ in compiled.rules] + [compiled.default]:
+            if label.upper() == doc_type.upper():
+                return label
+        return doc_type
+    
+    def _query(self, columns: List[str], doc_type: Optional[str] = None, select: Optional[str] = None,
+               tail: str = "ORDER BY postedDateISO DESC, id DESC",
+               stored: Optional[bool] = None) -> Tuple[str, list]:
+        """
+        SELECT over opportunities with the checker's filters in the WHERE
+        clause. stored=True/False restricts it to rows with/without a
+        current stored classification.
+        """
+        clauses, params = [], []
+        if self.since:
+            clauses.append("postedDateISO >= ?")
+            params.append(self.since)
+        if self.until:
+            clauses.append("postedDateISO <= ?")
+            params.append(self.until)
+        if self.agencies:
+            clauses.append(f"agency IN ({', '.join('?' for _ in self.agencies)})")
+            params.extend(self.agencies)
+        if self._use_stored and stored is not None:
+            clauses.append("classifier_version = ?" if stored else "classifier_version IS NOT ?")
+            params.append(CLASSIFIER_VERSION)
+        if doc_type and self._use_stored:
+            # Rows without a current classification are filtered by _stream
+            clauses.append("(document_type = ? AND classifier_version = ? OR classifier_version IS NOT ?)")
+            params.extend([self._label(doc_type), CLASSIFIER_VERSION, CLASSIFIER_VERSION])
+        
+        select = select or ", ".join(columns)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return f"SELECT {select} FROM opportunities {where} {tail}", params
+    
+    def _columns(self, with_description: bool) -> List[str]:
+        columns = list(_REPORT_COLUMNS)
+        if with_description:
+            columns.append("description")
+        if self._use_stored:
+            # Stored values only count when written by this CLASSIFIER_VERSION
+            columns.append(f"CASE WHEN classifier_version = {CLASSIFIER_VERSION} "
+                           f"THEN document_type END AS document_type")
+            columns.append(f"CASE WHEN classifier_version = {CLASSIFIER_VERSION} "
+                           f"THEN keyword_match END AS keyword_match")
+            if not with_description:
+                # Read along only for the rows that will be classified here
+                columns.append(f"CASE WHEN classifier_version IS NOT {CLASSIFIER_VERSION} "
+                               f"THEN description END AS stale_description")
+        return columns
+    
+    def _chunks(self, sql: str, params: list) -> Iterator[List[Dict]]:
+        """Stream query rows chunk_size at a time (per worker process)"""
+        size = self.chunk_size * worker_count(self.workers)
+        conn = connect(self.db_file)
         try:
-            conn = sqlite3.connect(self.db_file)
             conn.row_factory = sqlite3.Row
-            c = conn.cursor()
-            
-            c.execute("""
-                SELECT id, title, solicitationNumber, agency, type, description, 
-                       postedDate, naics, opportunityStatus, link
-                FROM opportunities 
-                ORDER BY postedDate DESC
-            """)
-            
-            for row in c.fetchall():
-                self.opportunities.append(dict(row))
-            
+            c = conn.execute(sql, params)
+            while True:
+                rows = c.fetchmany(size)
+                if not rows:
+                    break
+                yield [dict(row) for row in rows]
+        finally:
             conn.close()
+    
+    def _classify_chunk(self, rows: List[Dict]):
+        """Classify the rows without a stored classification in one classify_many() call"""
+        pending = [opp for opp in rows if not opp.get('document_type')]
+        if self.workers == 1 or len(pending) < 2:
+            return
+        compiled = self.classifier()
+        results = classify_many([self._text(opp) for opp in pending], compiled.rules, compiled.default,
+                                workers=self.workers, batch_size=self.chunk_size)
+        for opp, (found_type, keyword) in zip(pending, results):
+            opp["document_type"] = found_type
+            opp["keyword_match"] = keyword
+    
+    def load_opportunities(self):
+        """Load the filtered opportunities from database (unless lazy)"""
+        self._classified = {}
+        self._by_type = None
+        self.opportunities = []
+        try:
+            if not Path(self.db_file).exists():
+                raise FileNotFoundError(f"no database at {self.db_file}")
+            conn = connect(self.db_file)
+            try:
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(opportunities)")}
+            finally:
+                conn.close()
+            if not columns:
+                raise sqlite3.OperationalError("no such table: opportunities")
+            if "classifier_version" not in columns:
+                # Written before the classification columns (run init_db to add them)
+                self._use_stored = False
+            
+            if self.lazy:
+                self.opportunities = OpportunityStream(self, self.doc_type)
+                return
             
+            self.opportunities = list(self._stream(self.doc_type, with_description=True))
+        
         except Exception as e:
             print(f"❌ Error loading database: {e}")
             self.opportunities = []
     
-    def check_document_type(self, text: str) -> Tuple[str, str]:
+    def _stream(self, doc_type: Optional[str] = None, with_description: bool = False,
+                stored: Optional[bool] = None) -> Iterator[Dict]:
+        """Filtered opportunities, newest first, with document_type and keyword_match set"""
+        # Without stored values every row is classified, which needs its description
+        with_description = with_description or not self._use_stored
+        sql, params = self._query(self._columns(with_description), doc_type, stored=stored)
+        label = self._label(doc_type) if doc_type else None
+        for rows in self._chunks(sql, params):
+            for opp in rows:
+                if "stale_description" in opp:
+                    description = opp.pop("stale_description")
+                    if not opp.get("document_type"):
+                        opp["description"] = description
+            self._classify_chunk(rows)
+            for opp in rows:
+                found_type, keyword = self.classify(opp)
+                if label and found_type != label:
+                    continue
+                opp["document_type"] = found_type
+                opp["keyword_match"] = keyword
+                yield opp
+    
+    def _count(self, doc_type: Optional[str] = None) -> int:
+        if doc_type and not self._use_stored:
+            return sum(1 for _ in self._stream(doc_type))
+        # Stored types are counted in SQL, the rest classified as they stream
+        sql, params = self._query([], doc_type, select="COUNT(*)", tail="", stored=True if doc_type else None)
+        conn = connect(self.db_file)
+        try:
+            count = conn.execute(sql, params).fetchone()[0]
+        finally:
+            conn.close()
+        if doc_type:
+            count += sum(1 for _ in self._stream(doc_type, stored=False))
+        return count
+    
+    def description(self, opp: Dict) -> str:
+        """An opportunity's description, read from the database if it wasn't loaded"""
+        if "description" not in opp:
+            conn = connect(self.db_file)
+            try:
+                row = conn.execute("SELECT description FROM opportunities WHERE id = ?",
+                                   (opp.get("id"),)).fetchone()
+            finally:
+                conn.close()
+            opp["description"] = row[0] if row else None
+        return opp["description"] or ""
+    
+    def _text(self, opp: Dict) -> str:
+        return f"{opp.get('title', '')} {self.description(opp)}"
+    
+    @classmethod
+    def classifier(cls) -> KeywordClassifier:
+        """
+        Compiled matcher for the keyword lists, built once per class.
+        Precedence: any RFP keyword, then RFQ, then RFI (list order within each).
+        """
+        if cls.__dict__.get("_compiled") is None:
+            cls._compiled = KeywordClassifier([
+                ("RFP", cls.RFP_KEYWORDS),
+                ("RFQ", cls.RFQ_KEYWORDS),
+                ("RFI", cls.RFI_KEYWORDS),
+            ])
+        return cls._compiled
+    
+    @classmethod
+    def check_document_type(cls, text: str) -> Tuple[str, str]:
         """
         Check if text contains RFI, RFQ, or RFP keywords
         Returns tuple of (document_type, keyword_found)
         """
-        if not text:
-            return ("Unknown", "")
-        
-        text_lower = text.lower()
-        
-        # Check in order of specificity (RFP first as it's most common)
-        for keyword in self.RFP_KEYWORDS:
-            if keyword in text_lower:
-                return ("RFP", keyword.upper())
-        
-        for keyword in self.RFQ_KEYWORDS:
-            if keyword in text_lower:
-                return ("RFQ", keyword.upper())
-        
-        for keyword in self.RFI_KEYWORDS:
-            if keyword in text_lower:
-                return ("RFI", keyword.upper())
-        
-        return ("Solicitation", "")
+        return cls.classifier().classify(text)
     
-    def filter_by_document_type(self, doc_type: str) -> List[Dict]:
-        """Filter opportunities by document type (RFI, RFQ, RFP, or Solicitation)"""
-        results = []
+    def classify(self, opp: Dict) -> Tuple[str, str]:
+        """(document_type, keyword) for an opportunity: stored, or computed once per noticeId"""
+        if opp.get('document_type'):
+            return (opp['document_type'], opp.get('keyword_match') or "")
         
-        for opp in self.opportunities:
-            # Check title and description
-            combined_text = f"{opp.get('title', '')} {opp.get('description', '')}"
-            found_type, keyword = self.check_document_type(combined_text)
-            
-            if found_type.upper() == doc_type.upper():
-                results.append({
+        key = opp.get('noticeId') or ('id', opp.get('id'))
+        result = self._classified.get(key)
+        if result is None:
+            result = self.check_document_type(self._text(opp))
+            # A lazy checker doesn't keep per-row state
+            if not self.lazy:
+                self._classified[key] = result
+        return result
+    
+    def _classify_all(self) -> Dict[str, List[Dict]]:
+        """One pass over the opportunities, grouped by document type"""
+        if self._by_type is None:
+            by_type = {}
+            for opp in self.opportunities:
+                found_type, keyword = self.classify(opp)
+                by_type.setdefault(found_type, []).append({
                     **opp,
                     "document_type": found_type,
                     "keyword_match": keyword
                 })
-        
-        return results
+            self._by_type = by_type
+        return self._by_type
+    
+    def documents(self, doc_type: Optional[str] = None):
+        """
+        Opportunities of one document type (all if None): a list, or for a
+        lazy checker an OpportunityStream
+        """
+        if self.lazy:
+            if doc_type and self.doc_type and self._label(doc_type) != self._label(self.doc_type):
+                return []
+            return OpportunityStream(self, doc_type or self.doc_type)
+        return self.filter_by_document_type(doc_type) if doc_type else self.opportunities
+    
+    def filter_by_document_type(self, doc_type: str) -> List[Dict]:
+        """Filter opportunities by document type (RFI, RFQ, RFP, or Solicitation)"""
+        if self.lazy:
+            return list(self.documents(doc_type))
+        for found_type, docs in self._classify_all().items():
+            if found_type.upper() == doc_type.upper():
+                return list(docs)
+        return []
     
     def get_all_document_types(self) -> Dict[str, List[Dict]]:
         """Get all opportunities grouped by document type"""
-        rfi_docs = self.filter_by_document_type("RFI")
-        rfq_docs = self.filter_by_document_type("RFQ")
-        rfp_docs = self.filter_by_document_type("RFP")
-        others = self.filter_by_document_type("Solicitation")
+        if self.lazy:
+            by_type = {}
+            for opp in self.opportunities:
+                by_type.setdefault(opp["document_type"], []).append(opp)
+        else:
+            by_type = self._classify_all()
+        
+        return {
+            "RFI": list(by_type.get("RFI", [])),
+            "RFQ": list(by_type.get("RFQ", [])),
+            "RFP": list(by_type.get("RFP", [])),
+            "Other Solicitations": list(by_type.get("Solicitation", []))
+        }
+    
+    def count_by_document_type(self) -> Dict[str, int]:
+        """Number of opportunities per document type, without building the grouped lists"""
+        if not self.lazy:
+            counts = {found_type: len(docs) for found_type, docs in self._classify_all().items()}
+        elif self._use_stored:
+            sql, params = self._query([], self.doc_type, select="document_type, COUNT(*)",
+                                      tail="GROUP BY document_type", stored=True)
+            conn = connect(self.db_file)
+            try:
+                counts = Counter(dict(conn.execute(sql, params).fetchall()))
+            finally:
+                conn.close()
+            counts.update(opp["document_type"] for opp in self._stream(self.doc_type, stored=False))
+        else:
+            counts = Counter(opp["document_type"] for opp in self.opportunities)
         
         return {
-            "RFI": rfi_docs,
-            "RFQ": rfq_docs,
-            "RFP": rfp_docs,
-            "Other Solicitations": others
+            "RFI": counts.get("RFI", 0),
+            "RFQ": counts.get("RFQ", 0),
+            "RFP": counts.get("RFP", 0),
+            "Other Solicitations": counts.get("Solicitation", 0)
         }
     
     def print_summary(self):
         """Print summary of document types found"""
-        doc_types = self.get_all_document_types()
+        counts = self.count_by_document_type()
         
         print("\n" + "=" * 80)
         print("RFI/RFQ/RFP ANALYSIS SUMMARY")
         print("=" * 80 + "\n")
         
-        print(f"Total Opportunities: {len(self.opportunities)}\n")
+        print(f"Total Opportunities: {sum(counts.values())}\n")
         
-        for doc_type, docs in doc_types.items():
-            print(f"{doc_type}: {len(docs)} opportunities")
+        for doc_type, count in counts.items():
+            print(f"{doc_type}: {count} opportunities")
             
-            if docs:
+            if count:
                 print(f"  Examples:")
-                for doc in docs[:3]:
+                label = "Solicitation" if doc_type == "Other Solicitations" else doc_type
+                for doc in islice(self.documents(label), 3):
                     print(f"    - {doc['title'][:60]}")
                     print(f"      Solicitation: {doc['solicitationNumber']}")
                     print(f"      Agency: {doc['agency']}")
@@ -130,11 +385,10 @@ class RFIRFQRFPChecker:
     
     def print_detailed_report(self, doc_type: str = None):
         """Print detailed report for specific document type"""
+        docs = self.documents(doc_type)
         if doc_type:
-            docs = self.filter_by_document_type(doc_type)
             title = f"{doc_type} OPPORTUNITIES"
         else:
-            docs = self.opportunities
             title = "ALL OPPORTUNITIES"
         
         print("\n" + "=" * 80)
@@ -144,9 +398,7 @@ class RFIRFQRFPChecker:
         print(f"Total: {len(docs)} opportunities\n")
         
         for idx, doc in enumerate(docs, 1):
-            document_type, keyword = self.check_document_type(
-                f"{doc['title']} {doc.get('description', '')}"
-            )
+            document_type, keyword = self.classify(doc)
             
             print(f"{idx}. {doc['title']}")
             print(f"   Solicitation #: {doc['solicitationNumber']}")
@@ -172,8 +424,7 @@ class RFIRFQRFPChecker:
             writer.writeheader()
             
             for opp in self.opportunities:
-                combined_text = f"{opp.get('title', '')} {opp.get('description', '')}"
-                doc_type, keyword = self.check_document_type(combined_text)
+                doc_type, keyword = self.classify(opp)
                 
                 writer.writerow({
                     'solicitationNumber': opp.get('solicitationNumber', ''),
@@ -188,28 +439,97 @@ class RFIRFQRFPChecker:
         
         print(f"\n✓ Report exported to {filename}")
     
+    def analytics(self) -> OpportunityFrame:
+        """
+        Document type, agency, NAICS, notice type and posted week of the
+        filtered opportunities as an analytics.OpportunityFrame. A lazy
+        checker with stored classifications reads just those columns (and
+        classifies the rows whose stored classification isn't current).
+        """
+        columns = ["document_type", "agency", "naics", "notice_type", "posted_week"]
+        if self.lazy and self._use_stored:
+            sql, params = self._query([], self.doc_type, tail="", stored=True, select=(
+                "document_type, agency, naics, type, date(postedDateISO, 'weekday 0', '-6 days')"
+            ))
+            stale = self._stream(self.doc_type, stored=False)
+            return OpportunityFrame.from_rows(chain(self._tuples(sql, params), self._tuples_of(stale)), columns)
+        
+        return OpportunityFrame.from_rows(self._tuples_of(self.opportunities), columns)
+    
+    def _tuples_of(self, opportunities: Iterable[Dict]) -> Iterator[tuple]:
+        """analytics() columns of loaded opportunities"""
+        for opp in opportunities:
+            yield (self.classify(opp)[0], opp.get('agency'), opp.get('naics'), opp.get('type'),
+                   week_of(opp.get('postedDate')))
+    
+    def _tuples(self, sql: str, params: list) -> Iterator[tuple]:
+        conn = connect(self.db_file)
+        try:
+            c = conn.execute(sql, params)
+            while True:
+                rows = c.fetchmany(self.chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+    
     def get_statistics(self) -> Dict:
         """Get statistics about document types"""
-        doc_types = self.get_all_document_types()
-        
-        total = len(self.opportunities)
+        frame = self.analytics()
+        by_type = {group["value"]: group["count"] for group in frame.counts("document_type")}
+        total = frame.size
+        counts = {
+            "RFI": by_type.get("RFI", 0),
+            "RFQ": by_type.get("RFQ", 0),
+            "RFP": by_type.get("RFP", 0),
+        }
+        # Everything else, including any row without a document type, so
+        # the percentages add up to 100
+        counts["Other Solicitations"] = total - sum(counts.values())
         
         return {
             "total": total,
-            "rfi_count": len(doc_types["RFI"]),
-            "rfq_count": len(doc_types["RFQ"]),
-            "rfp_count": len(doc_types["RFP"]),
-            "other_count": len(doc_types["Other Solicitations"]),
-            "rfi_percentage": (len(doc_types["RFI"]) / total * 100) if total > 0 else 0,
-            "rfq_percentage": (len(doc_types["RFQ"]) / total * 100) if total > 0 else 0,
-            "rfp_percentage": (len(doc_types["RFP"]) / total * 100) if total > 0 else 0,
-            "other_percentage": (len(doc_types["Other Solicitations"]) / total * 100) if total > 0 else 0,
+            "rfi_count": counts["RFI"],
+            "rfq_count": counts["RFQ"],
+            "rfp_count": counts["RFP"],
+            "other_count": counts["Other Solicitations"],
+            "rfi_percentage": (counts["RFI"] / total * 100) if total > 0 else 0,
+            "rfq_percentage": (counts["RFQ"] / total * 100) if total > 0 else 0,
+            "rfp_percentage": (counts["RFP"] / total * 100) if total > 0 else 0,
+            "other_percentage": (counts["Other Solicitations"] / total * 100) if total > 0 else 0,
         }
+    
+    def print_trends(self, weeks: int = 12, limit: int = 5, window: int = 4):
+        """Print weekly volumes by document type and the top agencies and NAICS codes"""
+        frame = self.analytics()
+        types = ["RFI", "RFQ", "RFP", "Solicitation"]
+        
+        print("\n" + "=" * 80)
+        print(f"WEEKLY VOLUME (last {weeks} weeks, {window}-week rolling total)")
+        print("=" * 80 + "\n")
+        
+        print(f"{'Week of':<12}{'Total':>7}{'RFI':>6}{'RFQ':>6}{'RFP':>6}{'Other':>7}{'Rolling':>9}")
+        for week in frame.weekly("document_type", window=window)[-weeks:]:
+            counts = "".join(f"{week['counts'].get(t, 0):>{7 if t == 'Solicitation' else 6}}" for t in types)
+            print(f"{week['week']:<12}{week['total']:>7}{counts}{week['rolling_total']:>9}")
+        
+        for column, heading in [("agency", "TOP AGENCIES"), ("naics", "TOP NAICS CODES")]:
+            print(f"\n{heading}")
+            for row in frame.crosstab(column, "document_type", limit=limit)["rows"]:
+                shares = ", ".join(f"{'Other' if t == 'Solicitation' else t} {row['percentages'][t]:.1f}%"
+                                   for t in types if t in row["percentages"])
+                print(f"  {row['value']}: {row['total']} ({shares})")
+        
+        print("\n" + "=" * 80)
 
 
-def interactive_rfi_rfq_rfp_checker():
-    """Interactive CLI for RFI/RFQ/RFP checking"""
-    checker = RFIRFQRFPChecker()
+def interactive_rfi_rfq_rfp_checker(**filters):
+    """
+    Interactive CLI for RFI/RFQ/RFP checking
+    filters (since, until, agency, doc_type) are passed to the checker
+    """
+    checker = RFIRFQRFPChecker(lazy=True, **filters)
     
     if not checker.opportunities:
         print("❌ No opportunities found in database")
@@ -227,11 +547,12 @@ def interactive_rfi_rfq_rfp_checker():
         print("  4. View all RFP (Request for Proposal)")
         print("  5. View other solicitations")
         print("  6. View statistics")
-        print("  7. Export to CSV")
-        print("  8. Exit")
+        print("  7. View weekly trends and top agencies")
+        print("  8. Export to CSV")
+        print("  9. Exit")
         print("\n" + "=" * 80)
         
-        choice = input("\nEnter your choice (1-8): ").strip()
+        choice = input("\nEnter your choice (1-9): ").strip()
         
         if choice == "1":
             checker.print_summary()
@@ -261,12 +582,15 @@ def interactive_rfi_rfq_rfp_checker():
             print("\n" + "=" * 80)
         
         elif choice == "7":
+            checker.print_trends()
+        
+        elif choice == "8":
             filename = input("Enter filename (default: rfi_rfq_rfp_report.csv): ").strip()
             if not filename:
                 filename = "rfi_rfq_rfp_report.csv"
             checker.export_to_csv(filename)
         
-        elif choice == "8":
+        elif choice == "9":
             print("\nGoodbye! 👋\n")
             break
         
@@ -1,12 +1,72 @@
 import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from config import API_KEY, DEFAULT_DAYS, DEFAULT_LIMIT
+from config import API_KEY, DEFAULT_DAYS, DEFAULT_LIMIT, DEFAULT_WORKERS
+import http_client
 
 BASE_URL = "https://api.sam.gov/opportunities/v2/search"
 
+
+class SAMAPIError(Exception):
+    """Raised by search_sam(raise_on_error=True) when a page can't be fetched"""
+
 def format_date(dt):
     return dt.strftime("%m/%d/%Y")
 
+
+def _build_params(keyword, naics, agencies, notice_type, posted_from, posted_to, limit, offset):
+    """Build the query string for a single search page"""
+    params = {
+        "api_key": API_KEY,
+        "limit": limit,
+        "offset": offset,
+        "noticeType": notice_type,
+        "postedFrom": posted_from,
+        "postedTo": posted_to,
+    }
+
+    if keyword:
+        params["q"] = keyword
+    if naics:
+        params["naics"] = ",".join(naics) if isinstance(naics, list) else naics
+    if agencies:
+        params["agency"] = ",".join(agencies)
+
+    return params
+
+
+def _fetch_page(params, timeout):
+    """
+    Fetch one page of search results.
+    Returns the decoded JSON response, or None if the request failed.
+    """
+    offset = params["offset"]
+    limit = params["limit"]
+
+    try:
+        print(f"[{datetime.now()}] Fetching page {offset // limit + 1} (offset={offset})...")
+        response = http_client.get(BASE_URL, params=params, timeout=timeout)
+
+        if response.status_code != 200:
+            print(f"[{datetime.now()}] Error: {response.status_code}")
+            print(f"Response: {response.text[:200]}")
+            return None
+
+        data = response.json()
+        print(f"[{datetime.now()}] Got {len(data.get('opportunitiesData', []))} records from page {offset // limit + 1}")
+        return data
+
+    except requests.Timeout:
+        print(f"[{datetime.now()}] Error: Request timeout after {timeout} seconds")
+    except requests.RequestException as e:
+        print(f"[{datetime.now()}] Request error: {str(e)}")
+    except Exception as e:
+        print(f"[{datetime.now()}] Unexpected error: {str(e)}")
+
+    return None
+
+
 def search_sam(
     keyword=None,
     naics=None,
@@ -15,65 +75,105 @@ def search_sam(
     posted_from=None,
     posted_to=None,
     limit=DEFAULT_LIMIT,
-    timeout=30
+    timeout=30,
+    concurrent=False,
+    max_workers=DEFAULT_WORKERS,
+    raise_on_error=False
 ):
+    """
+    Generator that yields one batch (list of opportunity dicts) per result page.
+
+    With concurrent=True the first page is fetched on its own to read
+    totalRecords, then the remaining offsets are fetched in parallel by a
+    pool of max_workers threads. Batches are still yielded in offset order.
+
+    A page that still fails after retries ends the search early; with
+    raise_on_error=True a SAMAPIError is raised instead so callers that
+    need a complete pull (e.g. incremental sync) can tell.
+    """
     if not posted_from:
         posted_from = format_date(datetime.today() - timedelta(days=DEFAULT_DAYS))
     if not posted_to:
         posted_to = format_date(datetime.today())
 
+    def page_params(offset):
+        return _build_params(keyword, naics, agencies, notice_type,
+                             posted_from, posted_to, limit, offset)
+
+    if concurrent:
+        yield from _search_concurrent(page_params, limit, timeout, max_workers, raise_on_error)
+        return
+
     offset = 0
-    all_results = []
 
     while True:
-        params = {
-            "api_key": API_KEY,
-            "limit": limit,
-            "offset": offset,
-            "noticeType": notice_type,
-            "postedFrom": posted_from,
-            "postedTo": posted_to,
-        }
-
-        if keyword:
-            params["q"] = keyword
-        if naics:
-            params["naics"] = ",".join(naics) if isinstance(naics, list) else naics
-        if agencies:
-            params["agency"] = ",".join(agencies)
-
-        try:
-            print(f"[{datetime.now()}] Fetching page {offset // limit + 1} (offset={offset})...")
-            response = requests.get(BASE_URL, params=params, timeout=timeout)
-
-            if response.status_code != 200:
-                print(f"[{datetime.now()}] Error: {response.status_code}")
-                print(f"Response: {response.text[:200]}")
-                break
+        data = _fetch_page(page_params(offset), timeout)
+        if data is None:
+            print(f"[{datetime.now()}] ⚠ Giving up at offset {offset} after retries; results are incomplete")
+            if raise_on_error:
+                raise SAMAPIError(f"Failed to fetch page at offset {offset}")
+            break
 
-            data = response.json()
-            batch = data.get("opportunitiesData", [])
-            print(f"[{datetime.now()}] Got {len(batch)} records from this page")
+        batch = data.get("opportunitiesData", [])
+        if not batch:
+            break
+        yield batch
 
-            if not batch:
-                break
-            yield batch
+        if len(batch) < limit:
+            break
 
-            # all_results.extend(batch)
-            #
-            if len(batch) < limit:
-                break
+        offset += limit
 
-            offset += limit
 
-        except requests.Timeout:
-            print(f"[{datetime.now()}] Error: Request timeout after {timeout} seconds")
-            break
-        except requests.RequestException as e:
-            print(f"[{datetime.now()}] Request error: {str(e)}")
-            break
-        except Exception as e:
-            print(f"[{datetime.now()}] Unexpected error: {str(e)}")
-            break
+def _search_concurrent(page_params, limit, timeout, max_workers, raise_on_error=False):
+    """Fetch pages in parallel with a bounded window of in-flight requests"""
+    first = _fetch_page(page_params(0), timeout)
+    if first is None:
+        if raise_on_error:
+            raise SAMAPIError("Failed to fetch page at offset 0")
+        return
+
+    batch = first.get("opportunitiesData", [])
+    if not batch:
+        return
+    yield batch
+
+    total_records = int(first.get("totalRecords") or 0)
+    if len(batch) < limit or total_records <= limit:
+        return
+
+    offsets = iter(range(limit, total_records, limit))
+    print(f"[{datetime.now()}] {total_records} records available, "
+          f"fetching remaining pages with {max_workers} workers...")
 
-    #return all_results
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Keep at most 2 * max_workers pages in flight so finished pages
+        # waiting to be yielded in order don't pile up in memory.
+        pending = deque()
+
+        def submit_next():
+            offset = next(offsets, None)
+            if offset is not None:
+                pending.append(executor.submit(_fetch_page, page_params(offset), timeout))
+
+        for _ in range(max_workers * 2):
+            submit_next()
+
+        while pending:
+            data = pending.popleft().result()
+            if data is None:
+                print(f"[{datetime.now()}] ⚠ Giving up after retries; results are incomplete")
+                for future in pending:
+                    future.cancel()
+                if raise_on_error:
+                    raise SAMAPIError("Failed to fetch a page during concurrent search")
+                break
+
+            batch = data.get("opportunitiesData", [])
+            if not batch:
+                for future in pending:
+                    future.cancel()
+                break
+
+            submit_next()
+            yield batch
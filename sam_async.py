@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+"""
+Asyncio client for the SAM.gov opportunities API
+Multiplexes many searches and detail lookups over one connection pool
+"""
+
+import asyncio
+import atexit
+import threading
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    aiohttp = None
+    AIOHTTP_AVAILABLE = False
+
+from config import API_KEY, DEFAULT_DAYS, DEFAULT_LIMIT, DEFAULT_WORKERS, HTTP_POOL_MAXSIZE, MAX_RETRIES
+from http_client import RETRY_STATUSES
+from sam_api import BASE_URL, format_date, _build_params
+from throttle import get_throttler, backoff_delay
+
+
+class AsyncSAMClient:
+    """Async SAM.gov client sharing one aiohttp session across all calls"""
+
+    def __init__(self, api_key=None, max_connections=DEFAULT_WORKERS * 4,
+                 max_per_host=HTTP_POOL_MAXSIZE, timeout=30):
+        """
+        Initialize the client
+
+        Args:
+            api_key: SAM.gov API key (default: config.API_KEY)
+            max_connections: Size of the shared connection pool
+            max_per_host: Maximum simultaneous connections to one host
+            timeout: Total timeout in seconds for a single request
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp is required for the async client (pip install aiohttp)")
+
+        self.api_key = api_key or API_KEY
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.session = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def open(self):
+        """Create the shared session (must be called inside the event loop)"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections,
+                                               limit_per_host=self.max_per_host),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'User-Agent': 'SAM-Async-Client/1.0',
+                         'Accept-Encoding': 'gzip, deflate'}
+            )
+
+    async def close(self):
+        """Close the shared session and release pooled connections"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    async def _get_json(self, params: Dict, retries: int = MAX_RETRIES) -> Optional[Dict]:
+        """
+        GET the search endpoint, returning decoded JSON or None on failure.
+        Shares the process-wide throttler and retry policy with http_client.
+        """
+        await self.open()
+        throttler = get_throttler()
+
+        for attempt in range(retries + 1):
+            await asyncio.sleep(throttler.delay())
+            try:
+                async with self.session.get(BASE_URL, params=params) as response:
+                    retry_after = throttler.observe(response.status, response.headers)
+
+                    if response.status == 200:
+                        return await response.json(content_type=None)
+
+                    if response.status not in RETRY_STATUSES or attempt == retries:
+                        text = await response.text()
+                        print(f"[{datetime.now()}] Error: {response.status}")
+                        print(f"Response: {text[:200]}")
+                        return None
+
+                    print(f"[{datetime.now()}] HTTP {response.status}, retrying "
+                          f"(attempt {attempt + 1}/{retries})")
+
+            except asyncio.TimeoutError:
+                print(f"[{datetime.now()}] Error: Request timeout after {self.timeout} seconds")
+                retry_after = None
+            except aiohttp.ClientError as e:
+                print(f"[{datetime.now()}] Request error: {str(e)}")
+                retry_after = None
+
+            if attempt == retries:
+                break
+            # A 429 already paused the shared throttler; otherwise back off here
+            if retry_after is None:
+                await asyncio.sleep(backoff_delay(attempt))
+
+        return None
+
+    async def search(
+        self,
+        keyword=None,
+        naics=None,
+        agencies=None,
+        notice_type="Solicitation",
+        posted_from=None,
+        posted_to=None,
+        limit=DEFAULT_LIMIT
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        Async generator with the same contract as sam_api.search_sam:
+        yields one batch per page, in offset order.
+        """
+        if not posted_from:
+            posted_from = format_date(datetime.today() - timedelta(days=DEFAULT_DAYS))
+        if not posted_to:
+            posted_to = format_date(datetime.today())
+
+        offset = 0
+
+        while True:
+            params = _build_params(keyword, naics, agencies, notice_type,
+                                   posted_from, posted_to, limit, offset)
+            params["api_key"] = self.api_key
+
+            print(f"[{datetime.now()}] Fetching page {offset // limit + 1} (offset={offset})...")
+            data = await self._get_json(params)
+            if data is None:
+                break
+
+            batch = data.get("opportunitiesData", [])
+            print(f"[{datetime.now()}] Got {len(batch)} records from this page")
+
+            if not batch:
+                break
+            yield batch
+
+            if len(batch) < limit:
+                break
+
+            offset += limit
+
+    async def get_opportunity_details(self, solicitation_number: str) -> Optional[Dict]:
+        """Fetch the first opportunity matching a solicitation number"""
+        params = {
+            "api_key": self.api_key,
+            "solicitationNumber": solicitation_number
+        }
+
+        data = await self._get_json(params)
+        if data:
+            opportunities = data.get("opportunitiesData", [])
+            if opportunities:
+                return opportunities[0]
+
+        return None
+
+    async def get_many_details(self, solicitation_numbers: List[str]) -> Dict[str, Optional[Dict]]:
+        """Fetch details for several solicitations concurrently"""
+        results = await asyncio.gather(
+            *(self.get_opportunity_details(num) for num in solicitation_numbers)
+        )
+        return dict(zip(solicitation_numbers, results))
+
+    async def run_queries(self, queries: List[Dict]) -> Dict[int, List[Dict]]:
+        """
+        Run several searches concurrently on this client.
+
+        Args:
+            queries: List of search_sam keyword arguments
+
+        Returns:
+            Mapping of query index to the list of records it returned
+        """
+        async def collect(query):
+            records = []
+            async for batch in self.search(**query):
+                records.extend(batch)
+            return records
+
+        results = await asyncio.gather(*(collect(q) for q in queries))
+        return dict(enumerate(results))
+
+
+async def search_sam_async(**kwargs) -> AsyncIterator[List[Dict]]:
+    """async-for version of sam_api.search_sam using a short-lived client"""
+    async with AsyncSAMClient() as client:
+        async for batch in client.search(**kwargs):
+            yield batch
+
+
+# Background event loop shared by synchronous callers (Flask request threads)
+_background_loop = None
+_background_client = None
+_background_lock = threading.Lock()
+
+
+def _get_background_client() -> AsyncSAMClient:
+    """Start (once) a daemon thread running the shared loop and client"""
+    global _background_loop, _background_client
+
+    with _background_lock:
+        if _background_loop is None:
+            _background_loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=_background_loop.run_forever,
+                                      name="sam-async-loop", daemon=True)
+            thread.start()
+            _background_client = AsyncSAMClient()
+            atexit.register(_shutdown_background)
+
+    return _background_client
+
+
+def _shutdown_background():
+    """Close the shared client's pooled connections at interpreter exit"""
+    if _background_loop is not None and _background_loop.is_running():
+        future = asyncio.run_coroutine_threadsafe(_background_client.close(), _background_loop)
+        try:
+            future.result(5)
+        except Exception:
+            pass
+        _background_loop.call_soon_threadsafe(_background_loop.stop)
+
+
+def run_in_background(coro_factory, timeout=None):
+    """
+    Run a coroutine on the shared background loop from synchronous code.
+
+    Args:
+        coro_factory: Callable taking the shared AsyncSAMClient and
+            returning a coroutine, e.g. lambda c: c.get_opportunity_details(n)
+        timeout: Seconds to wait for the result (None waits forever)
+    """
+    client = _get_background_client()
+    future = asyncio.run_coroutine_threadsafe(coro_factory(client), _background_loop)
+    return future.result(timeout)
+
+
+def fetch_opportunity_details(solicitation_number: str) -> Optional[Dict]:
+    """Blocking detail lookup multiplexed on the shared background loop"""
+    return run_in_background(lambda client: client.get_opportunity_details(solicitation_number))
+
+
+if __name__ == "__main__":
+    async def demo():
+        async with AsyncSAMClient() as client:
+            results = await client.run_queries([
+                {"keyword": "IT", "naics": ["541511"]},
+                {"keyword": "IT", "naics": ["541512"]},
+            ])
+            for idx, records in results.items():
+                print(f"Query {idx}: {len(records)} records")
+
+    asyncio.run(demo())
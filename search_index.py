@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+"""
+In-process inverted index over opportunity records
+Tokenized AND/OR/prefix queries with relevance-ranked results
+"""
+
+import heapq
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Scored result sets kept for paging through recent queries
+SCORE_CACHE_SIZE = 16
+
+# Index field -> (record columns feeding it, ranking weight)
+INDEX_FIELDS = {
+    "title": (["title"], 3.0),
+    "description": (["description"], 1.0),
+    "naics": (["naicsCode", "naicsCodes", "naics"], 2.0),
+    "organization": (["organizationType", "fullParentPathName", "officeAddress", "agency"], 2.0),
+}
+
+
+def tokenize(text) -> List[str]:
+    if not text:
+        return []
+    return TOKEN_RE.findall(str(text).lower())
+
+
+class InvertedIndex:
+    """
+    Field-aware inverted index keyed by document id (position in the
+    caller's record list).
+
+    Query syntax: whitespace-separated terms are ANDed, 'OR' (upper case)
+    separates alternative clauses, and a trailing '*' makes a term a prefix
+    match. Results are ranked by field-weighted tf-idf. An empty query
+    matches every document, in id order.
+    """
+
+    def __init__(self, fields: Optional[Dict] = None):
+        self.fields = fields or INDEX_FIELDS
+        # field -> token -> {doc_id: term frequency}
+        self.postings = {name: defaultdict(dict) for name in self.fields}
+        self.doc_count = 0
+        self._vocab = {name: [] for name in self.fields}
+        self._vocab_dirty = set()
+        self._score_cache = OrderedDict()
+        # Guards the score cache and the lazily sorted vocabularies, which
+        # request threads share
+        self._lock = threading.Lock()
+        # Tokens whose posting dict belongs to this index rather than
+        # being shared with the index it was copied from
+        self._owned = {name: set() for name in self.fields}
+
+    def copy(self) -> "InvertedIndex":
+        """
+        Copy-on-write clone: posting dicts stay shared with this index until
+        the clone adds a document to them, so extending the clone costs time
+        proportional to the new documents, and this index is never modified.
+        """
+        clone = InvertedIndex(self.fields)
+        clone.postings = {name: defaultdict(dict, postings) for name, postings in self.postings.items()}
+        clone.doc_count = self.doc_count
+        with self._lock:
+            clone._vocab = dict(self._vocab)
+            clone._vocab_dirty = set(self._vocab_dirty)
+        return clone
+
+    def add(self, doc_id: int, record: Dict):
+        """Index one record"""
+        for name, (columns, _) in self.fields.items():
+            counts = defaultdict(int)
+            for column in columns:
+                for token in tokenize(record.get(column)):
+                    counts[token] += 1
+            if not counts:
+                continue
+            postings = self.postings[name]
+            owned = self._owned[name]
+            for token, tf in counts.items():
+                if token not in owned:
+                    postings[token] = dict(postings.get(token, ()))
+                    owned.add(token)
+                postings[token][doc_id] = tf
+            self._vocab_dirty.add(name)
+        self.doc_count += 1
+
+    def add_many(self, records: Iterable[Dict], start_id: int = 0):
+        """Index records whose ids continue from start_id"""
+        for offset, record in enumerate(records):
+            self.add(start_id + offset, record)
+
+    def _vocabulary(self, field: str) -> List[str]:
+        with self._lock:
+            if field in self._vocab_dirty:
+                self._vocab[field] = sorted(self.postings[field])
+                self._vocab_dirty.discard(field)
+            return self._vocab[field]
+
+    def _expand(self, field: str, term: str, prefix: bool) -> List[str]:
+        if not prefix:
+            return [term] if term in self.postings[field] else []
+        vocab = self._vocabulary(field)
+        start = bisect_left(vocab, term)
+        matches = []
+        for token in vocab[start:]:
+            if not token.startswith(term):
+                break
+            matches.append(token)
+        return matches
+
+    def _term_scores(self, term: str, prefix: bool, fields: List[str]) -> Dict[int, float]:
+        """Score every document matching one term in any of the fields"""
+        scores = defaultdict(float)
+        for field in fields:
+            weight = self.fields[field][1]
+            postings = self.postings[field]
+            for token in self._expand(field, term, prefix):
+                docs = postings[token]
+                idf = math.log(1 + self.doc_count / len(docs))
+                for doc_id, tf in docs.items():
+                    scores[doc_id] += weight * (1 + math.log(tf)) * idf
+        return scores
+
+    def _clause(self, terms, fields) -> Dict[int, float]:
+        """AND of terms: intersect matches, smallest posting set first"""
+        term_scores = sorted((self._term_scores(t, p, fields) for t, p in terms), key=len)
+        if not term_scores or not term_scores[0]:
+            return {}
+        result = dict(term_scores[0])
+        for scores in term_scores[1:]:
+            result = {doc_id: s + scores[doc_id] for doc_id, s in result.items() if doc_id in scores}
+            if not result:
+                break
+        return result
+
+    def _scores(self, query: str, fields: List[str], prefix_last: bool) -> Dict[int, float]:
+        """Score every matching document, reusing recent results for the same query"""
+        # doc_count changes whenever documents are added, invalidating old entries
+        key = (query, tuple(fields), prefix_last, self.doc_count)
+        with self._lock:
+            cached = self._score_cache.get(key)
+            if cached is not None:
+                self._score_cache.move_to_end(key)
+                return cached
+
+        scores = defaultdict(float)
+
+        for clause in re.split(r"\s+OR\s+", query.strip()):
+            terms = []
+            raw_terms = clause.split()
+            for idx, raw in enumerate(raw_terms):
+                prefix = raw.endswith("*") or (prefix_last and idx == len(raw_terms) - 1)
+                terms.extend((token, prefix) for token in tokenize(raw))
+            if not terms:
+                continue
+            for doc_id, score in self._clause(terms, fields).items():
+                scores[doc_id] = max(scores[doc_id], score)
+
+        with self._lock:
+            self._score_cache[key] = scores
+            if len(self._score_cache) > SCORE_CACHE_SIZE:
+                self._score_cache.popitem(last=False)
+        return scores
+
+    def search(self, query: str, fields: Optional[List[str]] = None, prefix_last: bool = False) -> List[int]:
+        """
+        Return matching document ids, best match first.
+
+        Args:
+            query: Query string (see class docstring for syntax)
+            fields: Index fields to search (default: all)
+            prefix_last: Treat the last term of each clause as a prefix,
+                for search-as-you-type
+        """
+        if not query.strip():
+            return list(range(self.doc_count))
+        scores = self._scores(query, fields or list(self.fields), prefix_last)
+        return sorted(scores, key=lambda doc_id: (-scores[doc_id], doc_id))
+
+    def search_page(self, query: str, fields: Optional[List[str]] = None, prefix_last: bool = False,
+                    after: Optional[Tuple[float, int]] = None,
+                    limit: int = 10) -> Tuple[List[Tuple[int, float]], int, bool]:
+        """
+        Keyset page of results ordered by (score desc, doc id asc).
+
+        Only the requested page is selected (a bounded heap over the
+        matches), so a deep page costs the same as the first one.
+
+        Args:
+            after: (score, doc_id) of the last result on the previous page
+            limit: Page size
+
+        Returns:
+            ([(doc_id, score), ...], total matches, whether more pages follow)
+        """
+        if not query.strip():
+            # No filter: every document, in id order, all scored 0
+            start = after[1] + 1 if after is not None else 0
+            end = min(start + limit, self.doc_count)
+            return [(doc_id, 0.0) for doc_id in range(start, end)], self.doc_count, end < self.doc_count
+
+        scores = self._scores(query, fields or list(self.fields), prefix_last)
+        keys = ((-score, doc_id) for doc_id, score in scores.items())
+        if after is not None:
+            boundary = (-after[0], after[1])
+            keys = (k for k in keys if k > boundary)
+
+        top = heapq.nsmallest(limit + 1, keys)
+        page = [(doc_id, -neg_score) for neg_score, doc_id in top[:limit]]
+        return page, len(scores), len(top) > limit
@@ -32,7 +32,7 @@ def main_with_filtering():
     # Now analyze document types
     print("Analyzing document types (RFI/RFQ/RFP)...\n")
     
-    checker = RFIRFQRFPChecker()
+    checker = RFIRFQRFPChecker(lazy=True)
     
     # Get statistics
     stats = checker.get_statistics()
@@ -47,6 +47,9 @@ def main_with_filtering():
     print(f"  Other Solicitations: {stats['other_count']} ({stats['other_percentage']:.1f}%)")
     print("=" * 80)
     
+    # Weekly volumes and top agencies/NAICS codes
+    checker.print_trends()
+    
     # Export analysis
     checker.export_to_csv("rfi_rfq_rfp_analysis.csv")
     
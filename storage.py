@@ -1,7 +1,15 @@
 import csv
+import json
 import sqlite3
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
 
-from config import DB_FILE, CSV_FILE
+from classifier import CLASSIFIER_VERSION, classify_document, classify_many, document_text, worker_count
+from config import (DB_FILE, CSV_FILE, CSV_ROTATE_BYTES, DB_BATCH_SIZE, SQLITE_CACHE_SIZE_KB, SQLITE_MMAP_SIZE,
+                    CLASSIFY_WORKERS, CLASSIFY_BATCH_SIZE)
+from migrations import migrate
 
 FIELDS = [
     "title", "solicitationNumber", "agency", "type",
@@ -15,6 +23,17 @@ EXTENDED_FIELDS = [
     "classificationCode", "pointOfContact", "uiLink"
 ]
 
+# Top-level fields of an opportunitiesData record, in CSV column order
+SAM_CSV_FIELDS = [
+    "noticeId", "title", "solicitationNumber", "fullParentPathName",
+    "fullParentPathCode", "postedDate", "type", "baseType", "archiveType",
+    "archiveDate", "typeOfSetAsideDescription", "typeOfSetAside",
+    "responseDeadLine", "naicsCode", "naicsCodes", "classificationCode",
+    "active", "award", "pointOfContact", "description", "organizationType",
+    "officeAddress", "placeOfPerformance", "additionalInfoLink", "uiLink",
+    "links", "resourceLinks"
+]
+
 def save_csv(results, filename=CSV_FILE):
     """Save results to CSV file with standard fields"""
     with open(filename, "w", newline="", encoding="utf-8") as f:
@@ -47,36 +66,241 @@ def save_csv_extended(results, filename="sam_results_extended.csv"):
     print(f"  Fields saved: {', '.join(fieldnames[:10])}{'...' if len(fieldnames) > 10 else ''}")
     return len(all_keys)
 
-def init_db():
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    
-    # Check if table exists
-    c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='opportunities'")
-    table_exists = c.fetchone()
+def _flatten(value):
+    """CSV cell for a value: nested lists/dicts as JSON, None as empty"""
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+class CSVSink:
+    """
+    Streaming CSV writer that appends batches to one rolling file.
+
+    The column set is fixed when the sink is created (SAM_CSV_FIELDS by
+    default), so every file shares one header. Nested values are written
+    as JSON. A new part file is started when the current one passes
+    max_bytes, and with rotate_daily each day gets its own file.
+    """
+
+    def __init__(self, directory, prefix="sam_results_extended", fieldnames=None,
+                 max_bytes=CSV_ROTATE_BYTES, rotate_daily=False):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.fieldnames = list(fieldnames or SAM_CSV_FIELDS)
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.file = None
+        self.writer = None
+        self.path = None
+        self.day = None
+        self.part = 0
+        self.records_written = 0
+        self.dropped_fields = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _file_path(self):
+        stem = self.prefix
+        if self.rotate_daily:
+            stem += f"_{self.day}"
+        if self.part:
+            stem += f"_{self.part}"
+        return self.directory / f"{stem}.csv"
+
+    def _header_matches(self, path):
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            return next(csv.reader(f), None) == self.fieldnames
+
+    def _open(self):
+        """Open the current part for appending, skipping full or foreign files"""
+        self.close()
+        while True:
+            path = self._file_path()
+            if not path.exists() or path.stat().st_size == 0:
+                break
+            if self._header_matches(path) and (not self.max_bytes or path.stat().st_size < self.max_bytes):
+                break
+            self.part += 1
+
+        new_file = not path.exists() or path.stat().st_size == 0
+        self.path = path
+        self.file = open(path, "a", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.file, fieldnames=self.fieldnames, extrasaction='ignore')
+        if new_file:
+            self.writer.writeheader()
+
+    def _rotate_if_needed(self):
+        today = datetime.now().strftime("%Y%m%d")
+        if self.rotate_daily and today != self.day:
+            self.day = today
+            self.part = 0
+            self._open()
+        elif self.file is None:
+            self.day = today
+            self._open()
+        elif self.max_bytes and self.file.tell() >= self.max_bytes:
+            self.part += 1
+            self._open()
+
+    def write_batch(self, records):
+        """Append a batch of records; returns the number written"""
+        fieldnames = self.fieldnames
+        count = 0
+        for r in records:
+            self._rotate_if_needed()
+            self.writer.writerow({k: _flatten(r.get(k)) for k in fieldnames})
+            count += 1
+            extra = r.keys() - fieldnames
+            if extra - self.dropped_fields:
+                self.dropped_fields |= extra
+                print(f"  ⚠ Fields not in CSV schema (skipped): {', '.join(sorted(extra))}")
+
+        if self.file is not None:
+            self.file.flush()
+        self.records_written += count
+        return count
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+        self.file = None
+        self.writer = None
+
+
+# Connection profile: WAL lets readers (checker, dashboards) run alongside
+# ingest, NORMAL sync is safe under WAL, and mmap/cache keep hot pages in memory
+PRAGMAS = [
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    f"PRAGMA cache_size = -{SQLITE_CACHE_SIZE_KB}",
+    f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE}",
+    "PRAGMA busy_timeout = 5000",
+]
+
+def connect(db_file=None):
+    """Open a connection to the opportunities database with the tuning profile applied"""
+    conn = sqlite3.connect(db_file or DB_FILE)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    conn.create_function("normalize_posted_date", 1, normalize_posted_date, deterministic=True)
+    # UPDATEs call both functions on the same row in turn; remembering the
+    # last row's result classifies it once
+    classified = lru_cache(maxsize=1)(classify_document)
+    conn.create_function("document_type_of", 2, lambda t, d: classified(t, d)[0], deterministic=True)
+    conn.create_function("document_keyword_of", 2, lambda t, d: classified(t, d)[1], deterministic=True)
+    return conn
+
+
+def init_db(reset=False):
+    """
+    Bring the database schema up to date without touching existing rows.
+    Pending migrations from migrations.py are applied in order; when the
+    schema is current this is just a version check.
+    With reset=True all tables are dropped first (full re-fetch).
+    """
+    conn = connect()
     
-    if table_exists:
-        # Drop and recreate table with new schema
-        c.execute("DROP TABLE IF EXISTS opportunities")
+    if reset:
+        for table in ("opportunities_fts", "opportunities", "sync_state", "jobs", "schema_version"):
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+        conn.commit()
     
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS opportunities (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT,
-            solicitationNumber TEXT,
-            noticeId TEXT,
-            agency TEXT,
-            type TEXT,
-            notice_type TEXT,
-            postedDate TEXT,
-            naics TEXT,
-            description TEXT,
-            opportunityStatus TEXT,
-            classificationCode TEXT,
-            pointOfContact TEXT,
-            link TEXT
-        )
-    """)
+    migrate(conn)
+    reclassify_stale(conn)
+    conn.close()
+
+
+def reclassify_stale(conn, workers=CLASSIFY_WORKERS, batch_size=CLASSIFY_BATCH_SIZE):
+    """
+    Classify rows that are new, whose title/description changed (save_db
+    clears their classifier_version) or that were classified by an older
+    CLASSIFIER_VERSION. Returns the number of rows updated.
+
+    With workers != 1 the text is classified on a process pool (see
+    classifier.classify_many), for back-filling a large table after a
+    CLASSIFIER_VERSION bump; otherwise in one UPDATE statement.
+    """
+    if workers != 1:
+        return _reclassify_parallel(conn, workers, batch_size)
+
+    with conn:
+        cursor = conn.execute("""
+            UPDATE opportunities
+            SET document_type = document_type_of(title, description),
+                keyword_match = document_keyword_of(title, description),
+                classifier_version = ?
+            WHERE classifier_version IS NULL OR classifier_version < ?
+        """, (CLASSIFIER_VERSION, CLASSIFIER_VERSION))
+    return cursor.rowcount
+
+
+def _reclassify_parallel(conn, workers, batch_size):
+    stale = "(classifier_version IS NULL OR classifier_version < ?)"
+    chunk_size = batch_size * worker_count(workers)
+    updated, last_id = 0, 0
+    while True:
+        rows = conn.execute(
+            f"SELECT id, title, description FROM opportunities WHERE {stale} AND id > ? ORDER BY id LIMIT ?",
+            (CLASSIFIER_VERSION, last_id, chunk_size)
+        ).fetchall()
+        if not rows:
+            break
+
+        results = classify_many([document_text(title, description) for _, title, description in rows],
+                                workers=workers, batch_size=batch_size)
+        with conn:
+            conn.executemany(
+                "UPDATE opportunities SET document_type = ?, keyword_match = ?, classifier_version = ? "
+                "WHERE id = ?",
+                [(doc_type, keyword, CLASSIFIER_VERSION, row[0]) for row, (doc_type, keyword) in zip(rows, results)]
+            )
+        updated += len(rows)
+        last_id = rows[-1][0]
+    return updated
+
+
+def normalize_posted_date(value):
+    """
+    Normalize a SAM.gov postedDate to ISO 'YYYY-MM-DD'.
+    Accepts ISO dates/timestamps and MM/DD/YYYY; returns None if unparseable.
+    """
+    if not value:
+        return None
+    value = str(value).strip()
+    for fmt, length in (("%Y-%m-%d", 10), ("%m/%d/%Y", 10)):
+        try:
+            return datetime.strptime(value[:length], fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return None
+
+
+def get_high_water(query_key):
+    """Return the stored high-water mark (ISO date) for a sync query, or None"""
+    conn = connect()
+    row = conn.execute(
+        "SELECT high_water FROM sync_state WHERE query_key = ?", (query_key,)
+    ).fetchone()
+    conn.close()
+    return row[0] if row else None
+
+
+def set_high_water(query_key, high_water, records=0):
+    """Record the high-water mark reached by a completed sync query"""
+    conn = connect()
+    conn.execute("""
+        INSERT OR REPLACE INTO sync_state (query_key, high_water, last_run, records)
+        VALUES (?, ?, ?, ?)
+    """, (query_key, high_water, datetime.now().isoformat(), records))
     conn.commit()
     conn.close()
 
@@ -92,36 +316,88 @@ def _convert_value(value):
     return value
 
 
-def save_db(results):
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
+# (DB column, API record key) pairs written by save_db, in column order
+DB_COLUMN_SOURCES = [
+    ("title", "title"),
+    ("solicitationNumber", "solicitationNumber"),
+    ("noticeId", "noticeId"),
+    ("agency", "agency"),
+    ("type", "type"),
+    ("notice_type", "notice_type"),
+    ("postedDate", "postedDate"),
+    ("naics", "naicsCode"),
+    ("description", "description"),
+    ("opportunityStatus", "opportunityStatus"),
+    ("classificationCode", "classificationCode"),
+    ("pointOfContact", "pointOfContact"),
+    ("link", "uiLink"),
+]
+
+# postedDateISO is derived from postedDate and appended after the sourced columns
+_DB_COLUMNS = [col for col, _ in DB_COLUMN_SOURCES] + ["postedDateISO"]
+_SOURCE_KEYS = [key for _, key in DB_COLUMN_SOURCES]
+_NOTICE_ID_POS = _DB_COLUMNS.index("noticeId")
+
+_UPSERT_SQL = f"""
+    INSERT INTO opportunities ({", ".join(_DB_COLUMNS)})
+    VALUES ({", ".join("?" for _ in _DB_COLUMNS)})
+    ON CONFLICT(noticeId) DO UPDATE SET
+        {", ".join(f"{col} = excluded.{col}" for col in _DB_COLUMNS if col != "noticeId")},
+        classifier_version = CASE
+            WHEN opportunities.title IS excluded.title AND opportunities.description IS excluded.description
+            THEN opportunities.classifier_version
+        END
+"""
 
+
+def _db_rows(results):
+    """Convert API records to column tuples in a single pass"""
+    convert = _convert_value
+    keys = _SOURCE_KEYS
     for r in results:
-        # Extract all available fields and convert list/dict values to strings
+        row = [convert(r.get(k)) for k in keys]
+        row.append(normalize_posted_date(r.get("postedDate")))
+        # Empty ids would all collide on the unique noticeId index
+        if not row[_NOTICE_ID_POS]:
+            row[_NOTICE_ID_POS] = None
+        yield tuple(row)
+
+
+def save_db(results, batch_size=DB_BATCH_SIZE):
+    """
+    Bulk upsert records into the opportunities table keyed by noticeId.
+
+    Rows are written with executemany, committing every batch_size rows.
+    Records without a noticeId are always inserted. If a batch fails, it is
+    retried row by row so one bad record doesn't drop its neighbours.
+    New rows and rows whose title or description changed are then
+    classified (document_type, keyword_match); unchanged rows keep theirs.
+    Returns the number of records written.
+    """
+    conn = connect()
+    c = conn.cursor()
+    rows = _db_rows(results)
+    written = 0
+
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            break
+
         try:
-            c.execute("""
-                INSERT INTO opportunities 
-                (title, solicitationNumber, noticeId, agency, type, notice_type, postedDate, naics, description, 
-                 opportunityStatus, classificationCode, pointOfContact, link)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                _convert_value(r.get("title")),
-                _convert_value(r.get("solicitationNumber")),
-                _convert_value(r.get("noticeId")),
-                _convert_value(r.get("agency")),
-                _convert_value(r.get("type")),
-                _convert_value(r.get("notice_type")),
-                _convert_value(r.get("postedDate")),
-                _convert_value(r.get("naicsCode")),
-                _convert_value(r.get("description")),
-                _convert_value(r.get("opportunityStatus")),
-                _convert_value(r.get("classificationCode")),
-                _convert_value(r.get("pointOfContact")),
-                _convert_value(r.get("uiLink"))
-            ))
-        except sqlite3.ProgrammingError as e:
-            print(f"Warning: Failed to insert record: {e}")
-            continue
+            with conn:
+                c.executemany(_UPSERT_SQL, chunk)
+            written += len(chunk)
+        except (sqlite3.ProgrammingError, sqlite3.IntegrityError):
+            for row in chunk:
+                try:
+                    with conn:
+                        c.execute(_UPSERT_SQL, row)
+                    written += 1
+                except (sqlite3.ProgrammingError, sqlite3.IntegrityError) as e:
+                    print(f"Warning: Failed to insert record: {e}")
+
+        reclassify_stale(conn)
 
-    conn.commit()
     conn.close()
+    return written
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""
+Incremental delta sync of SAM.gov opportunities
+Fetches only notices posted since each query's high-water mark and upserts them
+"""
+
+from datetime import datetime
+
+from sam_api import search_sam, format_date
+from storage import init_db, save_db, get_high_water, set_high_water, normalize_posted_date
+
+
+def query_key(keyword=None, naics=None, notice_type="Solicitation", agencies=None) -> str:
+    """Stable identifier for a query, used as the sync_state primary key"""
+    naics_part = ",".join(sorted(naics)) if isinstance(naics, list) else (naics or "")
+    agencies_part = ",".join(sorted(agencies)) if agencies else ""
+    return f"q={keyword or ''}|naics={naics_part}|type={notice_type or ''}|agency={agencies_part}"
+
+
+def sync_query(keyword=None, naics=None, notice_type="Solicitation", agencies=None, concurrent=True) -> int:
+    """
+    Sync one query into the database.
+
+    The first run pulls the default DEFAULT_DAYS window. Later runs start
+    from the day of the newest postedDate already stored for this query
+    (SAM.gov filters by day, and amendments are republished with a new
+    postedDate), so only the overlap day is fetched twice and upserting
+    by noticeId removes the duplicates. The high-water mark only moves
+    after a complete pull.
+
+    Returns the number of records upserted.
+    """
+    key = query_key(keyword, naics, notice_type, agencies)
+    high_water = get_high_water(key)
+
+    posted_from = None
+    if high_water:
+        posted_from = format_date(datetime.strptime(high_water, "%Y-%m-%d"))
+        print(f"[{datetime.now()}] Syncing {key} since {high_water}")
+    else:
+        print(f"[{datetime.now()}] No high-water mark for {key}, running full pull")
+
+    newest = high_water
+    total = 0
+
+    for batch in search_sam(
+        keyword=keyword,
+        naics=naics,
+        agencies=agencies,
+        notice_type=notice_type,
+        posted_from=posted_from,
+        concurrent=concurrent,
+        raise_on_error=True
+    ):
+        total += save_db(batch)
+        for r in batch:
+            posted = normalize_posted_date(r.get("postedDate"))
+            if posted and (newest is None or posted > newest):
+                newest = posted
+
+    if newest:
+        set_high_water(key, newest, total)
+
+    print(f"[{datetime.now()}] ✅ Synced {total} records for {key} (high-water: {newest})")
+    return total
+
+
+def sync_all(queries) -> int:
+    """Sync a list of queries (dicts of sync_query keyword arguments)"""
+    init_db()
+    return sum(sync_query(**query) for query in queries)
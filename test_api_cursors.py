@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+Test keyset paging of /api/opportunities and /api/search: following
+next_cursor visits every row once, and a cursor from before a reload is
+rejected instead of skipping or repeating rows
+"""
+
+import csv
+import shutil
+import tempfile
+from pathlib import Path
+
+from api_server import app, LOADER
+
+FIELDS = ["noticeId", "title", "solicitationNumber", "postedDate", "naicsCode", "description"]
+
+
+def check(condition, message):
+    if not condition:
+        print(f"✗ {message}")
+        exit(1)
+    print(f"✓ {message}")
+
+
+def write_rows(path, start, count, mode="w"):
+    with open(path, mode, newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        if mode == "w":
+            writer.writeheader()
+        for i in range(start, start + count):
+            writer.writerow({
+                "noticeId": f"n{i:03d}",
+                "title": f"Software services {i}" if i % 2 else f"Facility repair {i}",
+                "solicitationNumber": f"SOL-{i:03d}",
+                "postedDate": "12/20/2025",
+                "naicsCode": "541512",
+                "description": "software " * (i % 5 + 1),
+            })
+
+
+def follow(client, url):
+    """noticeIds of every page reached through next_cursor"""
+    ids, cursor = [], ""
+    while cursor is not None:
+        response = client.get(f"{url}&per_page=7&cursor={cursor}")
+        assert response.status_code == 200, response.get_json()
+        data = response.get_json()
+        ids += [row["noticeId"] for row in data["data"]]
+        cursor = data["next_cursor"]
+    return ids
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("KEYSET CURSOR TEST - /api/opportunities and /api/search")
+    print("=" * 80)
+    print()
+
+    data_dir = Path(tempfile.mkdtemp())
+    data_file = data_dir / "sam_results_extended.csv"
+    try:
+        write_rows(data_file, 0, 30)
+        LOADER.data_dir = data_dir
+        LOADER.refresh()
+        client = app.test_client()
+
+        ids = follow(client, "/api/opportunities?x=1")
+        check(ids == [f"n{i:03d}" for i in range(30)], "Opportunities: every row once, in order")
+
+        offset = client.get("/api/search?type=keyword&query=software&per_page=100").get_json()
+        ids = follow(client, "/api/search?type=keyword&query=software")
+        check(ids == [row["noticeId"] for row in offset["data"]] and len(ids) == offset["total"],
+              f"Search: cursor pages match the ranked results ({len(ids)} rows)")
+
+        first = client.get("/api/opportunities?per_page=7&cursor=").get_json()
+        search_first = client.get("/api/search?type=keyword&query=software&per_page=7&cursor=").get_json()
+        write_rows(data_file, 30, 5, mode="a")
+        check(LOADER.refresh(), "Appended rows reloaded")
+
+        for name, url in [("Opportunities", f"/api/opportunities?per_page=7&cursor={first['next_cursor']}"),
+                          ("Search", f"/api/search?type=keyword&query=software&per_page=7"
+                                     f"&cursor={search_first['next_cursor']}")]:
+            response = client.get(url)
+            check(response.status_code == 400 and response.get_json()["stale_cursor"],
+                  f"{name}: cursor from before the reload rejected")
+
+        check(len(follow(client, "/api/opportunities?x=1")) == 35, "Paging again from the first page sees the new rows")
+
+        response = client.get("/api/opportunities?cursor=not-a-cursor")
+        check(response.status_code == 400 and not response.get_json()["stale_cursor"], "Malformed cursor rejected")
+    finally:
+        shutil.rmtree(data_dir)
+
+    print("\n" + "=" * 80)
+    print("✅ TEST PASSED - Cursors page through one data version")
+    print("=" * 80)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+Test the schema migrations on a database in the original (pre-migration)
+shape: every existing row must be kept, except older duplicates of a noticeId
+"""
+
+import os
+import sqlite3
+
+from migrations import LATEST_VERSION, current_version, migrate
+from storage import connect, reclassify_stale
+
+TEST_DB = "test_migrations.db"
+
+# The opportunities table as the original init_db created it
+BASELINE_SCHEMA = """
+    CREATE TABLE opportunities (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT,
+        solicitationNumber TEXT,
+        noticeId TEXT,
+        agency TEXT,
+        type TEXT,
+        notice_type TEXT,
+        postedDate TEXT,
+        naics TEXT,
+        description TEXT,
+        opportunityStatus TEXT,
+        classificationCode TEXT,
+        pointOfContact TEXT,
+        link TEXT
+    )
+"""
+
+# (id, noticeId, title, postedDate)
+BASELINE_ROWS = [
+    (1, "a", "RFI: Old copy of notice a", "12/20/2025"),
+    (2, "a", "RFI: New copy of notice a", "12/21/2025"),
+    (3, "", "RFQ: First notice without an id", "12/22/2025"),
+    (4, "", "RFP: Second notice without an id", "2025-12-23"),
+    (5, None, "Solicitation without an id", "12/24/2025"),
+    (6, "b", "Request for Proposal b", "12/25/2025"),
+]
+
+
+def check(condition, message):
+    if not condition:
+        print(f"✗ {message}")
+        exit(1)
+    print(f"✓ {message}")
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("SCHEMA MIGRATION TEST - Baseline database")
+    print("=" * 80)
+    print()
+
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+
+    conn = sqlite3.connect(TEST_DB)
+    conn.execute(BASELINE_SCHEMA)
+    conn.executemany("INSERT INTO opportunities (id, noticeId, title, postedDate) VALUES (?, ?, ?, ?)",
+                     BASELINE_ROWS)
+    conn.commit()
+    conn.close()
+    print(f"Created a baseline database with {len(BASELINE_ROWS)} rows\n")
+
+    conn = connect(TEST_DB)
+    applied = migrate(conn)
+    print()
+    check(applied == LATEST_VERSION, f"Applied all {LATEST_VERSION} migrations")
+    check(current_version(conn) == LATEST_VERSION, f"schema_version is {LATEST_VERSION}")
+
+    ids = [row[0] for row in conn.execute("SELECT id FROM opportunities ORDER BY id")]
+    check(ids == [2, 3, 4, 5, 6], f"Kept every row but the older duplicate of 'a' (ids {ids})")
+    check(conn.execute("SELECT COUNT(*) FROM opportunities WHERE noticeId IS NULL").fetchone()[0] == 3,
+          "Rows without a noticeId are kept, with noticeId NULL")
+
+    dates = dict(conn.execute("SELECT id, postedDateISO FROM opportunities"))
+    check(dates[3] == "2025-12-22" and dates[4] == "2025-12-23", "postedDateISO back-filled")
+
+    check(reclassify_stale(conn) == 5, "Classified the migrated rows")
+    types = dict(conn.execute("SELECT id, document_type FROM opportunities"))
+    check((types[2], types[3], types[6]) == ("RFI", "RFQ", "RFP"), "Document types stored")
+
+    check(migrate(conn) == 0, "Migrating again applies nothing")
+    conn.close()
+    os.remove(TEST_DB)
+
+    print("\n" + "=" * 80)
+    print("✅ TEST PASSED - Migrations keep existing rows")
+    print("=" * 80)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""
+Test the bulk upsert in save_db: records are keyed by noticeId (updated in
+place, not duplicated), records without one are always inserted, changed
+rows are reclassified, and the FTS5 index follows inserts, updates and
+deletes through its triggers
+"""
+
+import os
+
+import storage
+from fts_search import search_fts
+from storage import connect, init_db, save_db
+
+TEST_DB = "test_save_db.db"
+
+
+def check(condition, message):
+    if not condition:
+        print(f"✗ {message}")
+        exit(1)
+    print(f"✓ {message}")
+
+
+def record(notice_id, title, description):
+    return {"noticeId": notice_id, "title": title, "description": description,
+            "postedDate": "12/20/2025", "naicsCode": "541512", "agency": "GENERAL SERVICES ADMINISTRATION"}
+
+
+def fts_ids(query):
+    rows, _ = search_fts(query, limit=50, db_file=TEST_DB)
+    return sorted(row["noticeId"] or "" for row in rows)
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("SAVE_DB TEST - Upsert by noticeId and full-text index triggers")
+    print("=" * 80)
+    print()
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(TEST_DB + suffix):
+            os.remove(TEST_DB + suffix)
+    storage.DB_FILE = TEST_DB
+    init_db()
+
+    written = save_db([
+        record("a", "RFP: Cloud migration", "Migrate the hosting platform"),
+        record("b", "RFI: Data analytics", "Market research for analytics tools"),
+        record("", "RFQ: Office furniture", "Desks and chairs"),
+    ], batch_size=2)
+    check(written == 3, "Wrote 3 records in batches of 2")
+
+    conn = connect(TEST_DB)
+    ids = dict(conn.execute("SELECT noticeId, id FROM opportunities WHERE noticeId IS NOT NULL"))
+    types = dict(conn.execute("SELECT noticeId, document_type FROM opportunities WHERE noticeId IS NOT NULL"))
+    check(types == {"a": "RFP", "b": "RFI"}, "New rows classified")
+    check(fts_ids("hosting") == ["a"] and fts_ids("analytics") == ["b"], "Inserted rows are in the FTS index")
+
+    save_db([
+        record("a", "RFQ: Cloud migration quotes", "Satellite ground station services"),
+        record("", "RFQ: Office furniture", "Desks and chairs"),
+    ])
+    rows = conn.execute("SELECT noticeId, id, title, document_type FROM opportunities ORDER BY id").fetchall()
+    check(len(rows) == 4, f"Updated 'a' in place and inserted the record without a noticeId again ({len(rows)} rows)")
+    updated = [r for r in rows if r[0] == "a"][0]
+    check(updated[1] == ids["a"] and updated[2] == "RFQ: Cloud migration quotes", "Upsert kept the row id of 'a'")
+    check(updated[3] == "RFQ", "Changed row reclassified")
+    check(fts_ids("satellite") == ["a"] and fts_ids("hosting") == [], "FTS index follows the update")
+    check(fts_ids("furniture") == ["", ""], "Both records without a noticeId indexed")
+
+    with conn:
+        conn.execute("DELETE FROM opportunities WHERE noticeId = 'b'")
+    check(fts_ids("analytics") == [], "FTS index follows the delete")
+    conn.close()
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(TEST_DB + suffix):
+            os.remove(TEST_DB + suffix)
+
+    print("\n" + "=" * 80)
+    print("✅ TEST PASSED - save_db upserts and keeps the FTS index in sync")
+    print("=" * 80)
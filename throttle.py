@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+"""
+Rate-limit-aware throttling for SAM.gov API calls
+Token bucket shared by every caller, adapted from the API's quota headers
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from config import (RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST, RATE_LIMIT_RESERVE,
+                    RETRY_BACKOFF_BASE, RETRY_BACKOFF_MAX)
+
+
+class TokenBucket:
+    """Thread-safe token bucket; callers reserve a slot and sleep for it"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        Take tokens now and return how many seconds the caller must wait
+        before using them. The balance may go negative, which queues later
+        callers behind this one.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= tokens
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.paused_until - now)
+
+    def acquire(self, tokens: float = 1):
+        """Block until tokens are available"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    def set_rate(self, rate: float):
+        with self.lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+    def pause(self, seconds: float):
+        """Hold every caller for the given number of seconds"""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+def parse_retry_after(value) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = RETRY_BACKOFF_BASE, cap: float = RETRY_BACKOFF_MAX) -> float:
+    """Exponential backoff with full jitter for the given 0-based attempt"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class AdaptiveThrottler:
+    """
+    Paces requests against the API key quota.
+
+    Requests run at max_rate until the X-RateLimit-Remaining header drops
+    below the reserve fraction of X-RateLimit-Limit; from then on the
+    remaining quota is spread evenly over the time left until it resets.
+    A 429 pauses every caller for the Retry-After period.
+    """
+
+    def __init__(self, max_rate: float = RATE_LIMIT_PER_SECOND,
+                 burst: float = RATE_LIMIT_BURST,
+                 reserve: float = RATE_LIMIT_RESERVE):
+        self.max_rate = max_rate
+        self.reserve = reserve
+        self.bucket = TokenBucket(max_rate, burst)
+        self.remaining = None
+        self.limit = None
+
+    def wait(self):
+        """Block until the next request may be sent"""
+        self.bucket.acquire()
+
+    def delay(self) -> float:
+        """Reserve the next slot and return the wait (for asyncio callers)"""
+        return self.bucket.reserve()
+
+    def observe(self, status_code: int, headers) -> Optional[float]:
+        """
+        Update pacing from a response.
+        Returns the Retry-After delay for a 429, otherwise None.
+        """
+        limit = _int_header(headers, 'X-RateLimit-Limit')
+        remaining = _int_header(headers, 'X-RateLimit-Remaining')
+        if limit is not None:
+            self.limit = limit
+        if remaining is not None:
+            self.remaining = remaining
+            self._adapt(_seconds_until_reset(headers))
+
+        if status_code == 429:
+            retry_after = parse_retry_after(headers.get('Retry-After'))
+            if retry_after is None:
+                retry_after = RETRY_BACKOFF_MAX
+            self.bucket.pause(retry_after)
+            return retry_after
+
+        return None
+
+    def _adapt(self, seconds_left: float):
+        low_water = (self.limit or 0) * self.reserve
+        if self.remaining > low_water:
+            rate = self.max_rate
+        else:
+            rate = max(self.remaining, 1) / max(seconds_left, 1.0)
+        self.bucket.set_rate(min(rate, self.max_rate))
+
+
+def _int_header(headers, name) -> Optional[int]:
+    try:
+        return int(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+def _seconds_until_reset(headers) -> float:
+    """Seconds until the quota resets (X-RateLimit-Reset, else UTC midnight)"""
+    reset = _int_header(headers, 'X-RateLimit-Reset')
+    if reset is not None:
+        # Either an epoch timestamp or a relative number of seconds
+        return reset - time.time() if reset > 10 ** 9 else float(reset)
+
+    now = datetime.now(timezone.utc)
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (midnight - now).total_seconds()
+
+
+_throttler = None
+_throttler_lock = threading.Lock()
+
+
+def get_throttler() -> AdaptiveThrottler:
+    """Return the process-wide throttler shared by all SAM.gov callers"""
+    global _throttler
+
+    if _throttler is None:
+        with _throttler_lock:
+            if _throttler is None:
+                _throttler = AdaptiveThrottler()
+
+    return _throttler
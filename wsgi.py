@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+"""
+Production entry point for the web dashboard API
+
+Linux/macOS - gunicorn with forked workers sharing the preloaded data:
+    gunicorn -c gunicorn.conf.py wsgi:app
+    kill -HUP <master pid>      # reload data, gracefully replace workers
+
+Any OS (incl. Windows) - waitress, one process with a thread pool:
+    python wsgi.py
+
+Both load and index the data before accepting connections, and serve
+/readyz (data version and index sizes) and /healthz.
+"""
+
+from api_server import app, LOADER
+from config import API_HOST, API_PORT, API_THREADS
+
+
+def serve_waitress():
+    """Multi-threaded single-process server; the data is shared by all threads"""
+    try:
+        from waitress import serve
+    except ImportError:
+        print("❌ waitress is not installed (pip install waitress), or use gunicorn -c gunicorn.conf.py wsgi:app")
+        return
+
+    # Poll data/ in-process: each reload swaps in a new dataset atomically
+    LOADER.start()
+    dataset = LOADER.dataset
+    print(f"✓ Loaded {len(dataset.records)} opportunities ({len(dataset.columns)} columns)")
+    print(f"🌐 Serving on http://{API_HOST}:{API_PORT} with {API_THREADS} threads")
+    serve(app, host=API_HOST, port=API_PORT, threads=API_THREADS)
+
+
+if __name__ == "__main__":
+    serve_waitress()